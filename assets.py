@@ -0,0 +1,145 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+
+class AssetsDisabled(Exception):
+    """Levée à la place du décodage quand les images sont désactivées (mode sans affichage)."""
+
+
+class AssetManager:
+    """Cache central des images.
+
+    Chaque image est décodée, convertie et redimensionnée une seule fois par
+    clé (chemin, taille, format) ; les surfaces renvoyées sont partagées et ne
+    doivent donc pas être modifiées par l'appelant. Les fichiers identiques
+    (ex. 1avatar.png et player_idle.png) sont dédupliqués par empreinte de
+    contenu. Avec enabled à faux (mode sans affichage), rien n'est décodé :
+    image() et poll() lèvent AssetsDisabled et les appelants passent sur
+    leur fallback.
+    """
+
+    def __init__(self):
+        self._digests = {}  # chemin absolu -> empreinte du contenu
+        self._decoded = {}  # (empreinte, alpha) -> surface convertie
+        self._scaled = {}   # (empreinte, taille, alpha) -> surface finale
+        self._images = {}   # (chemin, taille, alpha) -> surface finale
+        self._pending = {}  # (chemin, taille, alpha) -> Future du décodage
+        self._variants = {} # (empreinte, taille, alpha) -> (normale, retournée)
+        self._executor = None
+        self.enabled = True
+
+    def _digest(self, path):
+        key = os.path.abspath(path)
+        digest = self._digests.get(key)
+        if digest is None:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            self._digests[key] = digest
+        return digest
+
+    def image(self, path, size=None, alpha=True):
+        """Renvoie la surface partagée pour (path, size, alpha).
+
+        Lève une exception si le fichier est introuvable ou illisible, comme
+        pygame.image.load, pour que les appelants gardent leur fallback.
+        """
+        if not self.enabled:
+            raise AssetsDisabled(path)
+        key = (path, size, alpha)
+        surface = self._images.get(key)
+        if surface is not None:
+            return surface
+
+        digest = self._digest(path)
+        surface = self._scaled.get((digest, size, alpha))
+        if surface is None:
+            base = self._decoded.get((digest, alpha))
+            if base is None:
+                base = pygame.image.load(path)
+                base = base.convert_alpha() if alpha else base.convert()
+                self._decoded[(digest, alpha)] = base
+            surface = base if size is None else pygame.transform.scale(base, size)
+            self._scaled[(digest, size, alpha)] = surface
+
+        self._images[key] = surface
+        return surface
+
+    def variants(self, path, size=None, alpha=True):
+        """Renvoie (normale, retournée horizontalement), calculées une seule fois.
+
+        Indexer le tuple avec FLIPPED évite un pygame.transform.flip par
+        entité et par image dans les méthodes draw.
+        """
+        surface = self.image(path, size, alpha)
+        key = (self._digest(path), size, alpha)
+        pair = self._variants.get(key)
+        if pair is None:
+            pair = (surface, pygame.transform.flip(surface, True, False))
+            self._variants[key] = pair
+        return pair
+
+    def image_async(self, path, size=None, alpha=True):
+        """Lance le décodage de l'image dans le pool de threads.
+
+        Le décodage et la mise à l'échelle se font dans un thread ; la
+        conversion au format de l'écran, qui demande le display, est faite
+        par poll() sur le thread principal.
+        """
+        key = (path, size, alpha)
+        if not self.enabled or key in self._images or key in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                                thread_name_prefix='assets')
+        self._pending[key] = self._executor.submit(self._decode, path, size)
+
+    def poll(self, path, size=None, alpha=True):
+        """Renvoie la surface si elle est prête, None sinon (ne bloque jamais).
+
+        Lance le décodage si personne ne l'a demandé ; relève l'exception du
+        thread de décodage si le fichier est illisible.
+        """
+        if not self.enabled:
+            raise AssetsDisabled(path)
+        key = (path, size, alpha)
+        surface = self._images.get(key)
+        if surface is not None:
+            return surface
+
+        future = self._pending.get(key)
+        if future is None:
+            self.image_async(path, size, alpha)
+            return None
+        if not future.done():
+            return None
+
+        del self._pending[key]
+        digest, decoded = future.result()
+        self._digests[os.path.abspath(path)] = digest
+        surface = self._scaled.get((digest, size, alpha))
+        if surface is None:
+            surface = decoded.convert_alpha() if alpha else decoded.convert()
+            self._scaled[(digest, size, alpha)] = surface
+        self._images[key] = surface
+        return surface
+
+    @staticmethod
+    def _decode(path, size):
+        # Exécuté dans un thread du pool : pas d'accès au display ici
+        with open(path, 'rb') as f:
+            data = f.read()
+        surface = pygame.image.load(io.BytesIO(data), path)
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        return hashlib.sha1(data).hexdigest(), surface
+
+
+# Index des variantes renvoyées par AssetManager.variants
+NORMAL = 0
+FLIPPED = 1
+
+# Instance partagée par tout le jeu (survit aux relances de Game.__init__)
+assets = AssetManager()
@@ -0,0 +1,30 @@
+class TiledBackground:
+    """Fond du monde découpé en tuiles verticales.
+
+    Le monde (world_width pixels) est une bande où l'image de fond se
+    répète ; les tuiles sont des sous-surfaces de l'image déjà convertie,
+    donc aucune grande surface n'est allouée, quelle que soit la largeur du
+    monde. draw() ne blitte que les morceaux visibles, avec area=.
+    """
+
+    def __init__(self, image, world_width, tile_width=256):
+        self.image = image
+        self.world_width = world_width
+        self.image_width, self.height = image.get_size()
+        self.tile_width = tile_width
+        self.tiles = [image.subsurface((x, 0, min(tile_width, self.image_width - x), self.height))
+                      for x in range(0, self.image_width, tile_width)]
+
+    def draw(self, screen, camera_x):
+        camera_x = int(camera_x)
+        view_end = min(camera_x + screen.get_width(), self.world_width)
+        world_x = max(camera_x, 0)
+        while world_x < view_end:
+            # Position dans l'image répétée, puis dans la tuile
+            image_x = world_x % self.image_width
+            index = image_x // self.tile_width
+            tile = self.tiles[index]
+            offset = image_x - index * self.tile_width
+            width = min(tile.get_width() - offset, view_end - world_x)
+            screen.blit(tile, (world_x - camera_x, 0), (offset, 0, width, self.height))
+            world_x += width
@@ -0,0 +1,103 @@
+"""Mémoire des entités : __slots__ + données de type partagées, contre l'ancien __dict__.
+
+L'ancienne disposition est reproduite en recopiant dans un __dict__ par
+instance tous les champs que chaque objet stockait avant (état propre et
+copies des données de type : couleur, gravité, portée d'aggro, sprite...).
+Les ennemis sont mesurés avec leurs colonnes NumPy (EnemySystem).
+
+    python bench_memory.py [nombre]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from enums import Element, Direction
+from enemy import Enemy, EnemySystem
+from projectile import Projectile, UltraProjectile
+
+# Champs stockés par instance avant le passage aux __slots__
+LEGACY_FIELDS = {
+    Enemy: ('x', 'y', 'prev_x', 'prev_y', 'ground_level', 'width', 'height', 'enemy_type', 'element',
+            'kingdom_index', 'velocity_y', 'gravity', 'on_ground', 'max_hp', 'hp', 'attack', 'speed',
+            'size', 'color', 'sprites', 'sprite', 'has_sprite', 'direction', 'last_dx', 'move_timer',
+            'attack_cooldown', 'aggro_range'),
+    Projectile: ('x', 'y', 'prev_x', 'prev_y', 'direction', 'element', 'damage', 'speed', 'size',
+                 'lifetime', 'color'),
+    UltraProjectile: ('x', 'y', 'prev_x', 'prev_y', 'direction', 'element', 'damage', 'speed', 'size',
+                      'lifetime', 'pulse_timer', 'colors'),
+}
+
+
+class Legacy:
+    """Objet à __dict__, comme les entités avant les __slots__."""
+
+
+def to_legacy(entity, fields):
+    legacy = Legacy()
+    for field in fields:
+        value = getattr(entity, field)
+        # Les listes étaient recréées pour chaque instance
+        setattr(legacy, field, list(value) if field == 'colors' else value)
+    return legacy
+
+
+def make(cls, count):
+    if cls is Enemy:
+        # Colonnes NumPy + une vue Enemy par ennemi
+        system = EnemySystem()
+        for i in range(count):
+            system.spawn(i, ("mini", "normal", "boss")[i % 3], Element.FEU)
+        return system
+    if cls is Projectile:
+        return [Projectile(i, 0, Direction.RIGHT, Element.FEU, 10) for i in range(count)]
+    return [UltraProjectile(i, 0, Direction.RIGHT, Element.FEU) for i in range(count)]
+
+
+def measure(build):
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, size
+
+
+def hot_loop(objects, rounds=20):
+    # Accès typiques d'une mise à jour : lecture / écriture d'état par instance
+    start = time.perf_counter()
+    if isinstance(objects, EnemySystem):
+        # Les ennemis avancent par colonnes, en une opération pour tous
+        n = len(objects)
+        for _ in range(rounds):
+            objects.x[:n] += 1
+            objects.prev_x[:n] = objects.x[:n]
+        return (time.perf_counter() - start) / rounds * 1000
+    for _ in range(rounds):
+        for obj in objects:
+            obj.x += 1
+            obj.prev_x = obj.x
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    make(Enemy, 3)  # Charger les sprites partagés hors mesure
+
+    print(f"{count} objets par classe")
+    for cls, fields in LEGACY_FIELDS.items():
+        current, current_size = measure(lambda: make(cls, count))
+        legacy, legacy_size = measure(lambda: [to_legacy(entity, fields) for entity in current])
+        print(f"  {cls.__name__:16s} __dict__ : {legacy_size / count:6.0f} o/objet, "
+              f"__slots__ : {current_size / count:6.0f} o/objet "
+              f"({current_size / legacy_size:.0%}), "
+              f"boucle : {hot_loop(legacy):.2f} ms -> {hot_loop(current):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,42 @@
 # Constantes
 SCREEN_WIDTH = 1366
 SCREEN_HEIGHT = 768
-FPS = 60
+FPS = 60  # Limite d'images par seconde du rendu (0 = sans limite)
+
+# Simulation à pas fixe : TICK_RATE mises à jour par seconde, quelle que soit
+# la vitesse du rendu ; au-delà de MAX_FRAME_TIME secondes de retard, le jeu
+# ralentit au lieu d'enchaîner les rattrapages.
+TICK_RATE = 60
+MAX_FRAME_TIME = 0.25
+
+# Entrées d'un pas de simulation, un bit par action (un octet par pas dans le journal)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_HEAL = 8
+INPUT_FIRE = 16     # Clic gauche maintenu
+INPUT_SPECIAL = 32  # Double-clic : attaque spéciale
+
+# Dossier des journaux d'entrées de chaque partie (rejouables), None pour ne rien enregistrer
+INPUT_LOG_DIR = ".replays"
+
+# Transition vers le royaume suivant, en pas de simulation (3 s)
+KINGDOM_TRANSITION_TICKS = 3 * TICK_RATE
+
+# Présentation par rectangles sales (F4 pour basculer en jeu)
+DIRTY_RECT_PRESENTATION = False
+
+# Résolution de rendu interne : None = résolution native de l'écran,
+# (largeur, hauteur) ex. (1366, 768), ou fraction de la résolution native ex. 0.5.
+# Le gameplay étant placé en pixels dans le cadre SCREEN_WIDTH x SCREEN_HEIGHT, une
+# hauteur interne plus basse que SCREEN_HEIGHT est ramenée à SCREEN_HEIGHT (proportions
+# gardées) : 0.5 sur un écran 1920x1080 donne 1365x768, sur 1024x768 la résolution native.
+# L'image est agrandie vers l'écran avec le filtre RENDER_SCALING ("smooth" ou "nearest").
+RENDER_RESOLUTION = None
+RENDER_SCALING = "smooth"
+
+# Marge autour de l'écran pour le culling (halos qui débordent)
+CULL_MARGIN = 32
 
 # Couleurs
 WHITE = (255, 255, 255)
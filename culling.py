@@ -0,0 +1,42 @@
+import pygame
+from constants import CULL_MARGIN
+
+
+class ViewCuller:
+    """Élimine ce qui est hors de la vue avant de le dessiner.
+
+    begin() calcule une fois par image le rectangle visible (l'écran,
+    élargi de margin pour les halos) ; visible() compare les zones
+    screen_bounds() des entités à ce rectangle. drawn / culled comptent
+    ce qui a été dessiné ou ignoré pendant l'image.
+    """
+
+    def __init__(self, margin=CULL_MARGIN):
+        self.margin = margin
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self.drawn = 0
+        self.culled = 0
+
+    def begin(self, screen):
+        self.view = screen.get_rect().inflate(self.margin * 2, self.margin * 2)
+        self.drawn = 0
+        self.culled = 0
+
+    def visible(self, rect):
+        if self.view.colliderect(rect):
+            self.drawn += 1
+            return True
+        self.culled += 1
+        return False
+
+    def visible_items(self, items, camera_x, camera_y):
+        # Entités (ennemis, projectiles) dont la zone à l'écran touche la vue
+        return [item for item in items if self.visible(item.screen_bounds(camera_x, camera_y))]
+
+    def record(self, drawn, total):
+        # Comptes d'un lot déjà filtré ailleurs (particules)
+        self.drawn += drawn
+        self.culled += total - drawn
+
+    def stats_line(self):
+        return f"Culling : {self.drawn} dessinés, {self.culled} ignorés"
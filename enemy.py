@@ -1,165 +1,214 @@
-import random
 import pygame
 import math
+import numpy as np
 from enums import Element
+from assets import assets, NORMAL, FLIPPED
 from constants import RED, GREEN, BLACK, BLUE, WHITE
+from render_queue import LAYER_ENEMY, render_position
 
-class Enemy:
-    def __init__(self, x, y, enemy_type, element, kingdom_index=0):
-        self.x = x
-        self.ground_level = 640 # Ajusté pour être sur le sol
-        self.y = self.ground_level
-        self.width = 35
-        self.height = 40
-        self.enemy_type = enemy_type
-        self.element = element
-        self.kingdom_index = kingdom_index
-        
-        # Physics
-        self.velocity_y = 0
-        self.gravity = 0.8
-        self.on_ground = True
-        
-        # Difficulté progressive
-        hp_multiplier = 1.0 + (kingdom_index * 0.15)
-        
-        # Stats selon le type - dégâts réduits à 5-7
-        if enemy_type == "mini":
-            base_hp = 75
-            self.max_hp = int(base_hp * hp_multiplier)
-            self.hp = self.max_hp
-            self.attack = 5  # Réduit à 5 dégâts
-            self.speed = 2
-            self.size = 30
-        elif enemy_type == "normal":
-            base_hp = 100
-            self.max_hp = int(base_hp * hp_multiplier)
-            self.hp = self.max_hp
-            self.attack = 7  # 7 dégâts
-            self.speed = 1.5
-            self.size = 35
-        else:  # boss
-            base_hp = 200
-            self.max_hp = int(base_hp * hp_multiplier)
-            self.hp = self.max_hp
-            self.attack = 7  # 7 dégâts
-            self.speed = 1
-            self.size = 50
-        
-        # Couleur selon l'élément
-        if element == Element.FEU:
-            self.color = (255, 100, 50)
-        elif element == Element.EAU:
-            self.color = (50, 150, 255)
-        elif element == Element.TERRE:
-            self.color = (139, 90, 43)
-        elif element == Element.AIR:
-            self.color = (200, 230, 255)
-        else:
-            self.color = (80, 50, 100)
+HP_BAR_HEIGHT = 5
+HP_BAR_MAX_WIDTH = 64  # Au moins la plus grande taille d'ennemi
+_hp_bars = {}  # couleur -> bande pleine, blittée avec une zone à la largeur voulue
+
+
+def hp_bar(color):
+    bar = _hp_bars.get(color)
+    if bar is None:
+        bar = pygame.Surface((HP_BAR_MAX_WIDTH, HP_BAR_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            bar = bar.convert()
+        bar.fill(color)
+        _hp_bars[color] = bar
+    return bar
+
+
+class EnemyKind:
+    """Données partagées par tous les ennemis d'un même type et d'un même élément.
+
+    Stats de base, couleur et sprites ne sont stockés qu'une fois (poids-mouche) ;
+    chaque Enemy ne garde que son état propre et une référence vers son EnemyKind.
+    """
+    __slots__ = ('name', 'base_hp', 'attack', 'speed', 'size', 'color', 'sprites', 'sprite', 'has_sprite')
+    
+    # Stats selon le type - dégâts réduits à 5-7 : (PV de base, dégâts, vitesse, taille)
+    STATS = {
+        "mini": (75, 5, 2, 30),
+        "normal": (100, 7, 1.5, 35),
+        "boss": (200, 7, 1, 50),
+    }
+    
+    # Couleur selon l'élément
+    COLORS = {
+        Element.FEU: (255, 100, 50),
+        Element.EAU: (50, 150, 255),
+        Element.TERRE: (139, 90, 43),
+        Element.AIR: (200, 230, 255),
+    }
+    
+    _kinds = {}  # (type, élément) -> EnemyKind
+    
+    def __init__(self, name, element):
+        self.name = name
+        self.base_hp, self.attack, self.speed, self.size = self.STATS.get(name, self.STATS["boss"])
+        self.color = self.COLORS.get(element, (80, 50, 100))
         
-        # Charger le sprite du monstre
+        # Charger le sprite du monstre (normal + retourné, partagés par taille)
         try:
-            self.sprite = pygame.image.load('Monstre.png').convert_alpha()
-            self.sprite = pygame.transform.scale(self.sprite, (self.size * 2, self.size * 2))
+            self.sprites = assets.variants('Monstre.png', (self.size * 2, self.size * 2))
+            self.sprite = self.sprites[NORMAL]
             self.has_sprite = True
         except:
+            self.sprites = self.sprite = None
             self.has_sprite = False
-        
-        # IA
-        self.direction = random.choice([0, 1])  # 0=left, 1=right
-        self.move_timer = 0
-        self.attack_cooldown = 0
-        self.aggro_range = 300
     
-    def update(self, player_x, player_y, obstacles):
-        # Apply gravity
-        if not self.on_ground:
-            self.velocity_y += self.gravity
-            self.y += self.velocity_y
-            
-            # Check ground collision
-            if self.y >= self.ground_level:
-                self.y = self.ground_level
-                self.velocity_y = 0
-                self.on_ground = True
-        
-        # Only move horizontally when on ground
-        if self.on_ground:
-            # Calculer la distance au joueur
-            dx = player_x - self.x
-            distance = abs(dx)
-            
-            # Si le joueur est proche, le suivre horizontalement
-            if distance < self.aggro_range:
-                if dx > 0:
-                    self.x += self.speed
-                    self.last_dx = self.speed
-                elif dx < 0:
-                    self.x -= self.speed
-                    self.last_dx = -self.speed
-            else:
-                # Mouvement aléatoire horizontal
-                self.move_timer += 1
-                if self.move_timer >= 60:
-                    self.direction = random.choice([0, 1])  # 0=left, 1=right
-                    self.move_timer = 0
-                
-                if self.direction == 0:  # Gauche
-                    self.x -= self.speed
-                elif self.direction == 1:  # Droite
-                    self.x += self.speed
-            
-            # Vérifier les limites horizontales
-            if self.x < 0:
-                self.x = 0
-            elif self.x > 2000 - self.width:
-                self.x = 2000 - self.width
-        
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
+    @classmethod
+    def get(cls, name, element):
+        kind = cls._kinds.get((name, element))
+        if kind is None:
+            kind = cls(name, element)
+            cls._kinds[name, element] = kind
+        return kind
+
+
+class _Column:
+    """Attribut d'Enemy lu et écrit dans une colonne de son EnemySystem."""
+    __slots__ = ('name',)
     
-    def draw(self, screen, camera_x, camera_y):
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        return getattr(enemy.system, self.name)[enemy.index].item()
+    
+    def __set__(self, enemy, value):
+        getattr(enemy.system, self.name)[enemy.index] = value
+
+
+class Enemy:
+    """Un ennemi : vue sur une ligne des colonnes d'un EnemySystem.
+
+    L'état qui change à chaque pas (position, vitesse, IA, PV...) vit dans
+    les tableaux du système ; l'objet ne garde que son type (EnemyKind),
+    son élément et son indice, mis à jour quand le système se compacte.
+    """
+    __slots__ = ('system', 'index', 'kind', 'element', 'kingdom_index')
+    
+    # Constantes communes à tous les ennemis
+    ground_level = 640 # Ajusté pour être sur le sol
+    width = 35
+    height = 40
+    gravity = 0.8
+    aggro_range = 300
+    
+    x = _Column()
+    y = _Column()
+    prev_x = _Column()
+    prev_y = _Column()
+    velocity_y = _Column()
+    on_ground = _Column()
+    direction = _Column()  # 0=left, 1=right
+    last_dx = _Column()
+    move_timer = _Column()
+    attack_cooldown = _Column()
+    hp = _Column()
+    max_hp = _Column()
+    
+    def __init__(self, system, index, kind, element, kingdom_index=0):
+        self.system = system
+        self.index = index
+        self.kind = kind
+        self.element = element
+        self.kingdom_index = kingdom_index
+    
+    # Données du type (partagées)
+    @property
+    def enemy_type(self):
+        return self.kind.name
+    
+    @property
+    def attack(self):
+        return self.kind.attack
+    
+    @property
+    def speed(self):
+        return self.kind.speed
+    
+    @property
+    def size(self):
+        return self.kind.size
+    
+    @property
+    def color(self):
+        return self.kind.color
+    
+    @property
+    def sprites(self):
+        return self.kind.sprites
+    
+    @property
+    def sprite(self):
+        return self.kind.sprite
+    
+    @property
+    def has_sprite(self):
+        return self.kind.has_sprite
+    
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        # Commandes de rendu : sprite puis barre de vie, dans la même couche
+        x, y = render_position(self, alpha)
+        screen_x = int(x - camera_x)
+        screen_y = int(y - camera_y)
+        
+        kind = self.kind
         
         # Dessiner le sprite du monstre si disponible
-        if self.has_sprite:
+        if kind.has_sprite:
             # Calculer la position centrée
-            sprite_x = screen_x + self.width // 2 - self.sprite.get_width() // 2
-            sprite_y = screen_y + self.height // 2 - self.sprite.get_height() // 2
+            sprite_x = screen_x + self.width // 2 - kind.sprite.get_width() // 2
+            sprite_y = screen_y + self.height // 2 - kind.sprite.get_height() // 2
             
-            # Retourner le sprite si l'ennemi va à gauche
-            if hasattr(self, 'last_dx') and self.last_dx < 0:
-                sprite_to_draw = pygame.transform.flip(self.sprite, True, False)
-            else:
-                sprite_to_draw = self.sprite
+            # Sprite retourné (pré-calculé) si l'ennemi va à gauche
+            sprite_to_draw = kind.sprites[FLIPPED if self.last_dx < 0 else NORMAL]
             
-            screen.blit(sprite_to_draw, (sprite_x, sprite_y))
+            queue.blit(sprite_to_draw, (sprite_x, sprite_y), LAYER_ENEMY)
         else:
-            # Fallback: dessin géométrique
-            # Corps de l'ennemi
-            pygame.draw.circle(screen, self.color, 
-                             (screen_x + self.width // 2, screen_y + self.height // 2), 
-                             self.size // 2)
-            pygame.draw.circle(screen, BLACK,
-                             (screen_x + self.width // 2, screen_y + self.height // 2),
-                             self.size // 2, 2)
-            
-            # Yeux méchants
-            eye_y = screen_y + self.height // 2 - 5
-            pygame.draw.circle(screen, RED, (screen_x + self.width // 2 - 8, eye_y), 4)
-            pygame.draw.circle(screen, RED, (screen_x + self.width // 2 + 8, eye_y), 4)
+            queue.call(LAYER_ENEMY, self.draw_shape, screen_x, screen_y)
         
-        # Barre de vie
-        hp_bar_width = self.size
-        hp_bar_height = 5
+        # Barre de vie (bandes pleines blittées juste après le sprite : un
+        # ennemi dessiné ensuite la recouvre, comme avec l'ancien fill)
+        hp_bar_width = kind.size
         hp_percentage = self.hp / self.max_hp
         
-        pygame.draw.rect(screen, RED,
-                       (screen_x, screen_y - 10, hp_bar_width, hp_bar_height))
-        pygame.draw.rect(screen, GREEN,
-                       (screen_x, screen_y - 10, int(hp_bar_width * hp_percentage), hp_bar_height))
+        queue.blit(hp_bar(RED), (screen_x, screen_y - 10), LAYER_ENEMY, (0, 0, hp_bar_width, HP_BAR_HEIGHT))
+        queue.blit(hp_bar(GREEN), (screen_x, screen_y - 10), LAYER_ENEMY,
+                   (0, 0, int(hp_bar_width * hp_percentage), HP_BAR_HEIGHT))
+    
+    def draw_shape(self, screen, screen_x, screen_y):
+        # Fallback: dessin géométrique
+        # Corps de l'ennemi
+        pygame.draw.circle(screen, self.color, 
+                         (screen_x + self.width // 2, screen_y + self.height // 2), 
+                         self.size // 2)
+        pygame.draw.circle(screen, BLACK,
+                         (screen_x + self.width // 2, screen_y + self.height // 2),
+                         self.size // 2, 2)
+        
+        # Yeux méchants
+        eye_y = screen_y + self.height // 2 - 5
+        pygame.draw.circle(screen, RED, (screen_x + self.width // 2 - 8, eye_y), 4)
+        pygame.draw.circle(screen, RED, (screen_x + self.width // 2 + 8, eye_y), 4)
+    
+    def screen_bounds(self, camera_x, camera_y):
+        # Zone couverte à l'écran par submit (sprite + barre de vie)
+        screen_x = int(self.x - camera_x)
+        screen_y = int(self.y - camera_y)
+        half = self.sprite.get_width() // 2 if self.has_sprite else self.size // 2 + 1
+        center_x = screen_x + self.width // 2
+        center_y = screen_y + self.height // 2
+        rect = pygame.Rect(center_x - half, center_y - half, half * 2, half * 2)
+        return rect.union((screen_x, screen_y - 10, self.size, 5))
     
     def get_rect(self):
         return pygame.Rect(self.x, self.y, self.width, self.height)
@@ -167,3 +216,185 @@ class Enemy:
     def take_damage(self, damage):
         self.hp -= damage
         return self.hp <= 0
+
+
+class EnemySystem:
+    """Tous les ennemis d'un royaume dans des colonnes NumPy.
+
+    update() fait avancer tous les ennemis en une passe vectorisée, avec le
+    même comportement que l'ancien Enemy.update : gravité, poursuite du
+    joueur à moins de aggro_range pixels, sinon marche aléatoire avec
+    nouvelle direction tous les 60 pas, limites du monde, cooldown
+    d'attaque. Les ennemis s'itèrent comme une liste d'objets Enemy.
+    """
+
+    COLUMNS = (
+        ('x', np.float64), ('y', np.float64), ('prev_x', np.float64), ('prev_y', np.float64),
+        ('velocity_y', np.float64), ('on_ground', np.bool_), ('speed', np.float64),
+        ('direction', np.int8), ('last_dx', np.float64), ('move_timer', np.int32),
+        ('attack_cooldown', np.int32), ('hp', np.int64), ('max_hp', np.int64),
+    )
+    WORLD_LIMIT = 2000  # Limite de déplacement horizontal des ennemis
+
+    def __init__(self, capacity=16, rng=None):
+        self.capacity = capacity
+        self.count = 0
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.views = []
+        self.rng = rng if rng is not None else np.random.default_rng()  # Flux des directions
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, _ in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def spawn(self, x, enemy_type, element, kingdom_index=0):
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        kind = EnemyKind.get(enemy_type, element)
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = Enemy.ground_level
+        self.velocity_y[i] = 0
+        self.on_ground[i] = True
+        self.speed[i] = kind.speed
+        self.direction[i] = self.rng.integers(0, 2)
+        self.last_dx[i] = 0
+        self.move_timer[i] = 0
+        self.attack_cooldown[i] = 0
+        # Difficulté progressive
+        hp_multiplier = 1.0 + (kingdom_index * 0.15)
+        self.hp[i] = self.max_hp[i] = int(kind.base_hp * hp_multiplier)
+        enemy = Enemy(self, i, kind, element, kingdom_index)
+        self.views.append(enemy)
+        self.count += 1
+        return enemy
+
+    def store_previous(self):
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def update(self, player_x):
+        n = self.count
+        if n == 0:
+            return
+        x, y, vy = self.x[:n], self.y[:n], self.velocity_y[:n]
+        on_ground, speed = self.on_ground[:n], self.speed[:n]
+
+        # Apply gravity
+        falling = ~on_ground
+        if falling.any():
+            vy[falling] += Enemy.gravity
+            y[falling] += vy[falling]
+            # Check ground collision
+            landed = falling & (y >= Enemy.ground_level)
+            y[landed] = Enemy.ground_level
+            vy[landed] = 0
+            on_ground[landed] = True
+
+        # Only move horizontally when on ground
+        dx = player_x - x
+        chase = on_ground & (np.abs(dx) < Enemy.aggro_range)
+        wander = on_ground & ~chase
+
+        # Si le joueur est proche, le suivre horizontalement
+        step = np.sign(dx) * speed
+        moving = chase & (dx != 0)
+        x[moving] += step[moving]
+        self.last_dx[:n][moving] = step[moving]
+
+        # Mouvement aléatoire horizontal, nouvelle direction tous les 60 pas
+        move_timer, direction = self.move_timer[:n], self.direction[:n]
+        move_timer[wander] += 1
+        reroll = wander & (move_timer >= 60)
+        if reroll.any():
+            direction[reroll] = self.rng.integers(0, 2, int(reroll.sum()))
+            move_timer[reroll] = 0
+        x[wander] += np.where(direction[wander] == 0, -speed[wander], speed[wander])
+
+        # Vérifier les limites horizontales
+        np.clip(x, 0, self.WORLD_LIMIT - Enemy.width, out=x, where=on_ground)
+
+        cooldown = self.attack_cooldown[:n]
+        cooldown[cooldown > 0] -= 1
+
+    def build_broadphase(self):
+        """Prépare les tests de collision du pas : positions entières triées par x.
+
+        À appeler après update() ; first_hit() et touching() ne testent que
+        les ennemis dont l'intervalle en x recoupe le rectangle, trouvés par
+        dichotomie, sans structure reconstruite ennemi par ennemi.
+        """
+        n = self.count
+        self._left = self.x[:n].astype(np.int64)
+        self._top = self.y[:n].astype(np.int64)
+        self._order = np.argsort(self._left, kind='stable')
+        self._sorted_left = self._left[self._order]
+        self._alive = np.ones(n, dtype=np.bool_)
+
+    def _overlapping(self, rect):
+        # Index (ordre de la liste) des ennemis dont le rectangle chevauche rect :
+        # left < rect.right et left + width > rect.left, puis test en y
+        low = np.searchsorted(self._sorted_left, rect.left - Enemy.width, side='right')
+        high = np.searchsorted(self._sorted_left, rect.right, side='left')
+        candidates = self._order[low:high]
+        top = self._top[candidates]
+        return candidates[(top < rect.bottom) & (top + Enemy.height > rect.top)]
+
+    def first_hit(self, rect):
+        """Premier ennemi vivant (ordre de la liste) dont le rectangle chevauche rect, ou None."""
+        hit = self._overlapping(rect)
+        hit = hit[self._alive[hit]]
+        if len(hit) == 0:
+            return None
+        return self.views[int(hit.min())]
+
+    def mark_dead(self, enemy):
+        # Exclu des tests first_hit jusqu'au prochain build_broadphase
+        self._alive[enemy.index] = False
+
+    def touching(self, rect):
+        """Ennemis dont le rectangle (comme get_rect) chevauche rect, dans l'ordre."""
+        return [self.views[i] for i in np.sort(self._overlapping(rect)).tolist()]
+
+    def visible(self, view, camera_x, camera_y):
+        """Ennemis dont la zone à l'écran (sprite + barre de vie) peut toucher view."""
+        n = self.count
+        if n == 0:
+            return []
+        screen_x = (self.x[:n] - camera_x).astype(np.int64)
+        screen_y = (self.y[:n] - camera_y).astype(np.int64)
+        # Demi-côté couvrant le plus grand sprite et la barre de vie
+        half = max(max(kind.size, kind.sprite.get_width() // 2 if kind.has_sprite else 0)
+                   for kind in EnemyKind._kinds.values())
+        center_x = screen_x + Enemy.width // 2
+        center_y = screen_y + Enemy.height // 2
+        inside = ((center_x + half >= view.left) & (center_x - half < view.right)
+                  & (center_y + half >= view.top) & (center_y - half < view.bottom))
+        return [self.views[i] for i in np.flatnonzero(inside).tolist()]
+
+    def remove(self, killed):
+        # Compactage : les survivants sont ramenés au début des colonnes
+        keep = [i for i, enemy in enumerate(self.views) if enemy not in killed]
+        kept = len(keep)
+        for name, _ in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[keep]
+        self.views = [self.views[i] for i in keep]
+        for i, enemy in enumerate(self.views):
+            enemy.index = i
+        self.count = kept
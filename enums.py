@@ -4,6 +4,7 @@ class GameState(Enum):
     MENU = "menu"
     SETTINGS = "settings"
     SHOP = "shop"
+    LOADING = "loading"
     GAME = "game"
     VICTORY = "victory"
     GAME_OVER = "game_over"
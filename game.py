@@ -1,26 +1,50 @@
 import pygame
 import sys
-import random
-import math
-import cv2
 import os
+import time
+import hashlib
 from constants import *
 from enums import GameState, Element, Direction
-from particles import Particle
-from ui import Button
+from particles import ParticleSystem
+from ui import Button, Label, get_font, text_cache
+from hud import HudLayer
+from presenter import Presenter
+from culling import ViewCuller
+from render_queue import RenderQueue, LAYER_PARTICLES
+from surface_pool import surface_pool
+from assets import assets
+from quality import QualityGovernor
+from video import VideoBackground, pixel_layout
 from player import Player
 from kingdom import Kingdom
-from projectile import Projectile, SpecialProjectile, MegaProjectile, UltraProjectile
+from projectile import SpecialProjectile, MegaProjectile, UltraProjectile, ProjectilePool
+from replay import RandomStreams, InputLog, read_input
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    def __init__(self, seed=None, headless=False, size=None):
+        # Mode sans affichage (tests, serveurs) : fenêtre de taille size (par défaut
+        # SCREEN_WIDTH x SCREEN_HEIGHT), ni vidéo, ni musique, ni images décodées.
+        # Les pilotes SDL factices se choisissent avant pygame.init() (voir main.py)
+        self.headless = headless or getattr(self, 'headless', False)
+        if self.headless:
+            assets.enabled = False
+            self.display = pygame.display.set_mode(size or (SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.display = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
         pygame.display.set_caption("Avatar : L'Équilibre Perdu")
         self.clock = pygame.time.Clock()
         self.state = GameState.MENU
         
-        # Récupérer la taille réelle de l'écran
+        # Présentation (flip complet ou rectangles sales, F4), conservée entre relances.
+        # Le jeu dessine à la résolution interne (RENDER_RESOLUTION), agrandie vers l'écran
+        dirty_rects = self.presenter.dirty_rects if hasattr(self, 'presenter') else DIRTY_RECT_PRESENTATION
+        resolution = None if self.headless else RENDER_RESOLUTION
+        self.presenter = Presenter(self.display, dirty_rects, resolution, RENDER_SCALING)
+        self.screen = self.presenter.screen
+        
+        # Récupérer la taille de rendu (celle de l'écran en résolution native)
         self.screen_width, self.screen_height = self.screen.get_size()
+        surface_pool.set_resolution((self.screen_width, self.screen_height))
         
         # Calculer le facteur d'échelle (référence: 1366x768)
         self.scale_x = self.screen_width / 1366
@@ -28,48 +52,85 @@ class Game:
         self.scale = min(self.scale_x, self.scale_y)  # Utiliser le plus petit pour garder les proportions
         
         # Polices - adaptées à la taille de l'écran
-        self.title_font = pygame.font.Font(None, int(90 * self.scale))
-        self.subtitle_font = pygame.font.Font(None, int(55 * self.scale))
-        self.text_font = pygame.font.Font(None, int(40 * self.scale))
-        self.small_font = pygame.font.Font(None, int(30 * self.scale))
-        
-        # Animation du menu - Vidéo en arrière-plan
-        video_path = os.path.join(os.path.dirname(__file__), "Dragon_incrusté_dans_les_montagnes.mp4")
-        self.menu_video = cv2.VideoCapture(video_path)
-        self.menu_video_frame = None
+        self.title_font = get_font(int(90 * self.scale))
+        self.subtitle_font = get_font(int(55 * self.scale))
+        self.text_font = get_font(int(40 * self.scale))
+        self.small_font = get_font(int(30 * self.scale))
+        
+        # HUD en couche mise en cache, statistiques de rendu (F3)
+        self.hud = HudLayer(self.screen_width, self.scale, self.small_font)
+        self.show_stats = getattr(self, 'show_stats', False)
+
+        self.presented_state = None
+        self.presented_camera = None
+        self.presented_dialogue = None
+        self.game_rects = []
+        self.menu_frame = None
+        self.dialogue_visible = False
+        self.dialogue_rect = None
+        
+        # Animation du menu - Vidéo en arrière-plan, décodée dans un thread
+        if getattr(self, 'menu_video', None):
+            self.menu_video.close()  # Relance de __init__ (Réessayer / Menu)
+        # (mis en cache brut à la résolution de l'écran après la première lecture)
+        self.menu_video = None
+        if not self.headless:
+            video_path = os.path.join(os.path.dirname(__file__), "Dragon_incrusté_dans_les_montagnes.mp4")
+            cache_dir = os.path.join(os.path.dirname(__file__), ".cache")
+            self.menu_video = VideoBackground(video_path, (self.screen_width, self.screen_height),
+                                              pixel_layout(self.screen), cache_dir)
         
         # Initialisation audio
-        pygame.mixer.init()
-        try:    
-            path_musique = os.path.join(os.path.dirname(__file__), "musique_Avatar.mp3")
-            pygame.mixer.music.load(path_musique)
-            self.volume = 0.5  # Volume par défaut à 50%
-            pygame.mixer.music.set_volume(self.volume)
-            pygame.mixer.music.play(-1) # -1 pour boucler à l'infini
-        except:
-            print("Erreur : Fichier musique introuvable.")
-            self.volume = 0.5
+        self.volume = 0.5  # Volume par défaut à 50%
+        if not self.headless:
+            pygame.mixer.init()
+            try:    
+                path_musique = os.path.join(os.path.dirname(__file__), "musique_Avatar.mp3")
+                pygame.mixer.music.load(path_musique)
+                pygame.mixer.music.set_volume(self.volume)
+                pygame.mixer.music.play(-1) # -1 pour boucler à l'infini
+            except:
+                print("Erreur : Fichier musique introuvable.")
+        
+        # Flux aléatoires de la partie, tous dérivés de la graine (None = graine au hasard)
+        self.random_streams = RandomStreams(seed)
         
         # Jeu
         self.player = None
         self.camera_x = 0
         self.camera_y = 0
-        self.particles = []
-        self.projectiles = []
+        self.prev_camera_x = self.render_camera_x = 0  # Caméra au pas précédent / interpolée
+        self.particles = ParticleSystem(rng=self.random_streams.particles)
+        self.culler = ViewCuller()
+        self.render_queue = RenderQueue()
+        
+        # Gouverneur de qualité (budget 1000 / FPS ms), conservé entre relances
+        if not hasattr(self, 'quality'):
+            self.quality = QualityGovernor()
+        self.apply_quality()
+        self.projectiles = ProjectilePool()  # Projectiles actifs, objets recyclés
         
         # Royaumes
         self.kingdoms = [
-            Kingdom("Royaume de l'Eau", Element.EAU, (50, 100, 150), "eau.jpg", self.screen_width, self.screen_height, kingdom_index=0),
-            Kingdom("Royaume de la Terre", Element.TERRE, (100, 70, 40), "background_jungle.png", self.screen_width, self.screen_height, kingdom_index=1),
-            Kingdom("Royaume de l'Air", Element.AIR, (135, 206, 235), "air.jpg", self.screen_width, self.screen_height, kingdom_index=2),
-            Kingdom("Royaume du Feu", Element.FEU, (139, 50, 30), "feu.jpg", self.screen_width, self.screen_height, kingdom_index=3)
+            Kingdom("Royaume de l'Eau", Element.EAU, (50, 100, 150), "eau.jpg", self.screen_width, self.screen_height, kingdom_index=0,
+                    random_streams=self.random_streams),
+            Kingdom("Royaume de la Terre", Element.TERRE, (100, 70, 40), "background_jungle.png", self.screen_width, self.screen_height, kingdom_index=1,
+                    random_streams=self.random_streams),
+            Kingdom("Royaume de l'Air", Element.AIR, (135, 206, 235), "air.jpg", self.screen_width, self.screen_height, kingdom_index=2,
+                    random_streams=self.random_streams),
+            Kingdom("Royaume du Feu", Element.FEU, (139, 50, 30), "feu.jpg", self.screen_width, self.screen_height, kingdom_index=3,
+                    random_streams=self.random_streams)
         ]
         self.current_kingdom_index = 0
         self.current_kingdom = None
         
+        # Seul le premier royaume est décodé tout de suite (en arrière-plan)
+        self.kingdoms[self.current_kingdom_index].request_background()
+        
         # Dialogue
         self.dialogue_text = ""
         self.dialogue_timer = 0
+        self.transition_timer = 0  # Pas restants avant le royaume suivant
         
         # Keybindings - Touches configurables
         self.default_keybindings = {
@@ -87,20 +148,48 @@ class Game:
         # Double-click detection for special attack
         self.last_click_time = 0
         self.double_click_threshold = 300  # 300ms max between clicks
+        self.special_requested = False  # Envoyé au prochain pas (bit INPUT_SPECIAL)
+        
+        # Journal des entrées de la partie en cours (rejouable)
+        self.input_log = None
         
         # Créer le joueur dès le départ (pour la boutique)
         self.player = Player(80, 200)
+        
+        # Interface des écrans (menu, boutique, paramètres, fin de partie)
+        self.build_ui()
     
     def start_game(self):
         self.player = Player(80, 200)  # Spawn au sol
         self.current_kingdom = self.kingdoms[self.current_kingdom_index]
         self.camera_x = 0
         self.camera_y = 0
-        self.projectiles = []
-        self.particles = []
-        self.state = GameState.GAME
+        self.prev_camera_x = self.render_camera_x = 0
+        self.projectiles.clear()
+        self.particles.clear()
+        self.transition_timer = 0
+        self.special_requested = False
+        self.input_log = InputLog(self.random_streams.seed, (self.screen_width, self.screen_height))
+        self.enter_kingdom()
+        self.show_dialogue(f"Bienvenue dans le {self.current_kingdom.name}...")
+    
+    def enter_next_kingdom(self):
+        # Fin de la transition : le joueur arrive sur le pont du royaume suivant
+        self.current_kingdom = self.kingdoms[self.current_kingdom_index]
+        self.player.x = self.player.prev_x = 100
+        self.player.y = self.player.prev_y = 630  # Spawn on the bridge
+        self.projectiles.clear()
+        self.enter_kingdom()
         self.show_dialogue(f"Bienvenue dans le {self.current_kingdom.name}...")
     
+    def enter_kingdom(self):
+        # Écran de chargement tant que le fond du royaume n'est pas décodé
+        self.current_kingdom.request_background()
+        if self.current_kingdom.background_ready():
+            self.state = GameState.GAME
+        else:
+            self.state = GameState.LOADING
+    
     def show_dialogue(self, text):
         self.dialogue_text = text
         self.dialogue_timer = 180
@@ -118,177 +207,217 @@ class Game:
         self.camera_y = 0
     
     def create_particles(self, x, y, color, count=15):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 8)
-            velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
-            self.particles.append(Particle(x, y, color, velocity))
+        self.particles.emit(x, y, color, count)
     
-    def draw_menu(self):
-        # Lire et afficher la vidéo en arrière-plan
-        ret, frame = self.menu_video.read()
-        
-        # Si la vidéo est terminée, recommencer au début
-        if not ret:
-            self.menu_video.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.menu_video.read()
+    def apply_quality(self):
+        # Appliquer le niveau de qualité courant (particules, halos)
+        self.particles.emission = self.quality.particle_emission
+        self.particles.limit = self.quality.particle_limit
+        SpecialProjectile.glow_level = self.quality.glow_level
+    
+    def build_ui(self):
+        # Widgets créés une seule fois par écran (mode retenu) ; seuls leurs
+        # textes et couleurs sont mis à jour ensuite, et re-rendus si besoin
+        cx = self.screen_width // 2
         
-        if ret:
-            # Convertir le frame OpenCV (BGR) en format Pygame (RGB)
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Obtenir les dimensions de la vidéo
-            video_height, video_width = frame.shape[:2]
-            
-            # Calculer les ratios pour remplir l'écran (mode "cover")
-            scale_width = self.screen_width / video_width
-            scale_height = self.screen_height / video_height
-            scale = max(scale_width, scale_height)  # Utiliser le plus grand pour couvrir tout l'écran
-            
-            # Nouvelles dimensions après scaling
-            new_width = int(video_width * scale)
-            new_height = int(video_height * scale)
-            
-            # Redimensionner la vidéo
-            frame = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
-            
-            # Calculer les offsets pour centrer et cropper
-            x_offset = (new_width - self.screen_width) // 2
-            y_offset = (new_height - self.screen_height) // 2
-            
-            # Cropper la partie centrale pour qu'elle corresponde exactement à la taille de l'écran
-            frame = frame[y_offset:y_offset + self.screen_height, x_offset:x_offset + self.screen_width]
-            
-            # Convertir en surface Pygame
-            frame_surface = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
-            self.screen.blit(frame_surface, (0, 0))
+        # === MENU ===
+        button_width = int(350 * self.scale)
+        button_height = int(75 * self.scale)
+        button_x = cx - button_width // 2
+        shadow_offset = int(5 * self.scale)
+        self.menu_labels = [
+            Label("AVATAR", self.title_font, (139, 69, 19), center=(cx + shadow_offset, int(185 * self.scale))),
+            Label("AVATAR", self.title_font, (255, 215, 0), center=(cx, int(180 * self.scale))),
+            Label("Héritier des 4 Mondes", self.subtitle_font, (255, 250, 205), center=(cx, int(260 * self.scale))),
+            Label("Le destin d'Aelyra repose entre tes mains...", self.small_font, (255, 250, 205),
+                  center=(cx, self.screen_height - int(60 * self.scale)))
+        ]
+        self.menu_buttons = {
+            'start': Button(button_x, int(340 * self.scale), button_width, button_height,
+                            "Commencer le Jeu", (34, 139, 34), (50, 180, 50), self.scale),
+            'shop': Button(button_x, int(430 * self.scale), button_width, button_height,
+                           "Boutique", (180, 140, 40), (220, 180, 60), self.scale),
+            'settings': Button(button_x, int(520 * self.scale), button_width, button_height,
+                               "Paramètres", (70, 70, 150), (100, 100, 200), self.scale),
+            'quit': Button(button_x, int(610 * self.scale), button_width, button_height,
+                           "Quitter le Jeu", (139, 0, 0), (180, 0, 0), self.scale)
+        }
         
-        # Titre
-        title_text = self.title_font.render("AVATAR", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
+        # === BOUTIQUE ===
+        button_width = int(400 * self.scale)
+        button_height = int(100 * self.scale)
+        center_x = cx - button_width // 2
+        mega_y = int(280 * self.scale)
+        ultra_y = int(430 * self.scale)
+        desc_offset = button_height + int(5 * self.scale)
+        self.shop_title = Label("BOUTIQUE", self.title_font, (255, 215, 0), center=(cx, int(80 * self.scale)))
+        self.shop_gold = Label("", self.text_font, (255, 215, 0), center=(cx, int(150 * self.scale)))
+        self.shop_current = Label("", self.small_font, (200, 200, 200), center=(cx, int(200 * self.scale)))
+        self.shop_mega_desc = Label("Etoile rotative - 250 degats - Effet cyan", self.small_font, (150, 200, 255),
+                                    topleft=(center_x, mega_y + desc_offset))
+        self.shop_ultra_desc = Label("Anneaux cosmiques - 500 degats - Arc-en-ciel", self.small_font, (255, 150, 255),
+                                     topleft=(center_x, ultra_y + desc_offset))
+        self.shop_buttons = {
+            'mega': Button(center_x, mega_y, button_width, button_height, "", (80, 80, 80), (100, 200, 255), self.scale),
+            'ultra': Button(center_x, ultra_y, button_width, button_height, "", (80, 80, 80), (255, 150, 255), self.scale),
+            'back': Button(int(50 * self.scale), self.screen_height - int(100 * self.scale),
+                           int(200 * self.scale), int(60 * self.scale),
+                           "Retour", (100, 50, 50), (150, 80, 80), self.scale)
+        }
         
-        # Ombre du titre
-        shadow_text = self.title_font.render("AVATAR", True, (139, 69, 19))
-        shadow_offset = int(5 * self.scale)
-        shadow_rect = shadow_text.get_rect(center=(self.screen_width // 2 + shadow_offset, int(185 * self.scale)))
-        self.screen.blit(shadow_text, shadow_rect)
-        self.screen.blit(title_text, title_rect)
+        # === PARAMÈTRES ===
+        self.settings_labels = [
+            Label("PARAMÈTRES", self.title_font, (255, 215, 0), center=(cx, int(100 * self.scale))),
+            Label("Configuration des touches", self.text_font, (200, 200, 200), center=(cx, int(180 * self.scale)))
+        ]
+        y_vol = int(580 * self.scale)
+        x_vol = cx - int(150 * self.scale)
+        self.volume_bar = pygame.Rect(x_vol, y_vol, int(300 * self.scale), int(20 * self.scale))
+        self.volume_label = Label("", self.text_font, WHITE,
+                                  topleft=(x_vol - int(180 * self.scale), y_vol - int(10 * self.scale)))
         
-        # Sous-titre
-        subtitle_text = self.subtitle_font.render("Héritier des 4 Mondes", True, (255, 250, 205))
-        subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, int(260 * self.scale)))
-        self.screen.blit(subtitle_text, subtitle_rect)
+        # Actions et leurs touches
+        actions = {
+            'move_left': 'Déplacer à gauche',
+            'move_right': 'Déplacer à droite',
+            'jump': 'Sauter',
+            'heal': 'Soin (Eau)'
+        }
+        y_start = int(260 * self.scale)
+        y_spacing = int(80 * self.scale)
+        key_button_x = cx + int(50 * self.scale)
+        self.action_labels = {}
+        self.key_buttons = {}
+        for i, (action_key, action_name) in enumerate(actions.items()):
+            y_pos = y_start + i * y_spacing
+            self.action_labels[action_key] = Label(action_name + ":", self.text_font, WHITE,
+                                                   topleft=(int(150 * self.scale), y_pos + int(15 * self.scale)))
+            self.key_buttons[action_key] = Button(key_button_x, y_pos, int(250 * self.scale), int(60 * self.scale),
+                                                  "", (50, 50, 100), (80, 80, 150), self.scale)
+        
+        button_width = int(300 * self.scale)
+        button_height = int(70 * self.scale)
+        self.settings_buttons = {
+            'reset': Button(cx - button_width - int(20 * self.scale), self.screen_height - int(150 * self.scale),
+                            button_width, button_height, "Réinitialiser", (100, 50, 0), (150, 80, 0), self.scale),
+            'back': Button(cx + int(20 * self.scale), self.screen_height - int(150 * self.scale),
+                           button_width, button_height, "Retour", (0, 100, 0), (0, 150, 0), self.scale)
+        }
+        self.key_instruction = Label("Appuyez sur ESC pour annuler", self.small_font, YELLOW,
+                                     center=(cx, self.screen_height - int(50 * self.scale)))
         
-        # Boutons
+        # === VICTOIRE ===
+        messages = [
+            "Tu as libéré tous les Gardiens !",
+            "L'équilibre est restauré dans Aelyra.",
+            "Le Néant a été vaincu.",
+            "Tu es le véritable Avatar !"
+        ]
+        message_spacing = int(55 * self.scale)
+        self.victory_labels = [Label("VICTOIRE !", self.title_font, (255, 215, 0), center=(cx, int(180 * self.scale)))]
+        for i, message in enumerate(messages):
+            self.victory_labels.append(Label(message, self.text_font, WHITE,
+                                             center=(cx, int(300 * self.scale) + i * message_spacing)))
         button_width = int(350 * self.scale)
         button_height = int(75 * self.scale)
-        start_button = Button(self.screen_width // 2 - button_width // 2, int(340 * self.scale), 
-                            button_width, button_height, 
-                            "Commencer le Jeu", (34, 139, 34), (50, 180, 50), self.scale)
-        shop_button = Button(self.screen_width // 2 - button_width // 2, int(430 * self.scale), 
-                           button_width, button_height,
-                           "Boutique", (180, 140, 40), (220, 180, 60), self.scale)
-        settings_button = Button(self.screen_width // 2 - button_width // 2, int(520 * self.scale), 
-                               button_width, button_height,
-                               "Paramètres", (70, 70, 150), (100, 100, 200), self.scale)
-        quit_button = Button(self.screen_width // 2 - button_width // 2, int(610 * self.scale), 
-                           button_width, button_height,
-                           "Quitter le Jeu", (139, 0, 0), (180, 0, 0), self.scale)
-        
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
+        button_x = cx - button_width // 2
+        self.victory_button = Button(button_x, int(540 * self.scale), button_width, button_height,
+                                     "Retour au Menu", (34, 139, 34), (50, 180, 50), self.scale)
+        
+        # === GAME OVER ===
+        self.game_over_labels = [
+            Label("GAME OVER", self.title_font, RED, center=(cx, int(210 * self.scale))),
+            Label("Le Néant a triomphé...", self.text_font, WHITE, center=(cx, int(320 * self.scale)))
+        ]
+        self.game_over_buttons = {
+            'retry': Button(button_x, int(420 * self.scale), button_width, button_height,
+                            "Réessayer", (139, 0, 0), (180, 0, 0), self.scale),
+            'menu': Button(button_x, int(520 * self.scale), button_width, button_height,
+                           "Menu Principal", (100, 100, 100), (150, 150, 150), self.scale)
+        }
+    
+    def draw_menu(self):
+        # Vidéo en arrière-plan (image courante fournie par le thread de décodage)
+        frame_surface = self.menu_video.get_surface()
+        if frame_surface:
+            self.screen.blit(frame_surface, (0, 0))
+        if frame_surface is not self.menu_frame:
+            self.menu_frame = frame_surface
+            self.presenter.invalidate()
         
-        start_button.check_hover(mouse_pos)
-        shop_button.check_hover(mouse_pos)
-        settings_button.check_hover(mouse_pos)
-        quit_button.check_hover(mouse_pos)
+        # Titre, ombre, sous-titre et texte d'ambiance
+        for label in self.menu_labels:
+            label.draw(self.screen)
         
-        start_button.draw(self.screen)
-        shop_button.draw(self.screen)
-        settings_button.draw(self.screen)
-        quit_button.draw(self.screen)
+        # Boutons
+        mouse_pos = self.presenter.mouse_pos()
+        mouse_pressed = pygame.mouse.get_pressed()
         
-        # Texte d'ambiance
-        ambient_text = self.small_font.render("Le destin d'Aelyra repose entre tes mains...", True, (255, 250, 205))
-        ambient_rect = ambient_text.get_rect(center=(self.screen_width // 2, self.screen_height - int(60 * self.scale)))
-        self.screen.blit(ambient_text, ambient_rect)
+        for button in self.menu_buttons.values():
+            button.check_hover(mouse_pos)
+            button.draw(self.screen)
         
-        if start_button.is_clicked(mouse_pos, mouse_pressed):
+        if self.menu_buttons['start'].is_clicked(mouse_pos, mouse_pressed):
             self.start_game()
         
-        if shop_button.is_clicked(mouse_pos, mouse_pressed):
+        if self.menu_buttons['shop'].is_clicked(mouse_pos, mouse_pressed):
             self.state = GameState.SHOP
         
-        if settings_button.is_clicked(mouse_pos, mouse_pressed):
+        if self.menu_buttons['settings'].is_clicked(mouse_pos, mouse_pressed):
             self.state = GameState.SETTINGS
         
-        if quit_button.is_clicked(mouse_pos, mouse_pressed):
-            pygame.quit()
-            sys.exit()
+        if self.menu_buttons['quit'].is_clicked(mouse_pos, mouse_pressed):
+            self.quit()
     
     def draw_shop(self):
         # Fond
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(240)
-        overlay.fill((30, 25, 20))
+        overlay = surface_pool.panel((self.screen_width, self.screen_height), (30, 25, 20), 240)
         self.screen.blit(overlay, (0, 0))
         
         # Titre
-        title_text = self.title_font.render("BOUTIQUE", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(80 * self.scale)))
-        self.screen.blit(title_text, title_rect)
+        self.shop_title.draw(self.screen)
         
         # Or du joueur
-        gold_text = self.text_font.render(f"Votre Or: {self.player.gold}", True, (255, 215, 0))
-        gold_rect = gold_text.get_rect(center=(self.screen_width // 2, int(150 * self.scale)))
-        self.screen.blit(gold_text, gold_rect)
+        self.shop_gold.set_text(f"Votre Or: {self.player.gold}")
+        self.shop_gold.draw(self.screen)
         
         # Attaque actuelle
         attack_names = ["Boule de Base", "Attaque Mega", "Attaque Ultra"]
         current_name = attack_names[self.player.special_attack_type]
-        current_text = self.small_font.render(f"Attaque actuelle: {current_name}", True, (200, 200, 200))
-        current_rect = current_text.get_rect(center=(self.screen_width // 2, int(200 * self.scale)))
-        self.screen.blit(current_text, current_rect)
+        self.shop_current.set_text(f"Attaque actuelle: {current_name}")
+        self.shop_current.draw(self.screen)
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.presenter.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
-        button_width = int(400 * self.scale)
-        button_height = int(100 * self.scale)
-        center_x = self.screen_width // 2 - button_width // 2
-        
         # Bouton Mega (200 or)
-        mega_y = int(280 * self.scale)
+        mega_button = self.shop_buttons['mega']
         mega_owned = self.player.special_attack_type >= 1
         mega_color = (50, 100, 50) if mega_owned else ((0, 150, 200) if self.player.gold >= 200 else (80, 80, 80))
-        mega_label = "MEGA [POSSEDE]" if mega_owned else "MEGA - 200 Or"
-        mega_button = Button(center_x, mega_y, button_width, button_height, mega_label, mega_color, (100, 200, 255), self.scale)
+        mega_button.set_text("MEGA [POSSEDE]" if mega_owned else "MEGA - 200 Or")
+        mega_button.set_colors(mega_color, (100, 200, 255))
         mega_button.check_hover(mouse_pos)
         mega_button.draw(self.screen)
         
         # Description Mega
         if not mega_owned:
-            mega_desc = self.small_font.render("Etoile rotative - 250 degats - Effet cyan", True, (150, 200, 255))
-            self.screen.blit(mega_desc, (center_x, mega_y + button_height + int(5 * self.scale)))
+            self.shop_mega_desc.draw(self.screen)
         
         # Bouton Ultra (500 or)
-        ultra_y = int(430 * self.scale)
+        ultra_button = self.shop_buttons['ultra']
         ultra_owned = self.player.special_attack_type >= 2
         ultra_color = (50, 100, 50) if ultra_owned else ((200, 50, 200) if self.player.gold >= 500 else (80, 80, 80))
-        ultra_label = "ULTRA [POSSEDE]" if ultra_owned else "ULTRA - 500 Or"
-        ultra_button = Button(center_x, ultra_y, button_width, button_height, ultra_label, ultra_color, (255, 150, 255), self.scale)
+        ultra_button.set_text("ULTRA [POSSEDE]" if ultra_owned else "ULTRA - 500 Or")
+        ultra_button.set_colors(ultra_color, (255, 150, 255))
         ultra_button.check_hover(mouse_pos)
         ultra_button.draw(self.screen)
         
         # Description Ultra
         if not ultra_owned:
-            ultra_desc = self.small_font.render("Anneaux cosmiques - 500 degats - Arc-en-ciel", True, (255, 150, 255))
-            self.screen.blit(ultra_desc, (center_x, ultra_y + button_height + int(5 * self.scale)))
+            self.shop_ultra_desc.draw(self.screen)
         
         # Bouton Retour
-        back_button = Button(int(50 * self.scale), self.screen_height - int(100 * self.scale), 
-                            int(200 * self.scale), int(60 * self.scale),
-                            "Retour", (100, 50, 50), (150, 80, 80), self.scale)
+        back_button = self.shop_buttons['back']
         back_button.check_hover(mouse_pos)
         back_button.draw(self.screen)
         
@@ -306,43 +435,32 @@ class Game:
     
     def draw_settings(self):
         # Fond semi-transparent
-        overlay = pygame.Surface((self.screen_width, self.screen_height))
-        overlay.set_alpha(230)
-        overlay.fill((20, 20, 40))
+        overlay = surface_pool.panel((self.screen_width, self.screen_height), (20, 20, 40), 230)
         self.screen.blit(overlay, (0, 0))
         
-        # Titre
-        title_text = self.title_font.render("PARAMÈTRES", True, (255, 215, 0))
-        title_rect = title_text.get_rect(center=(self.screen_width // 2, int(100 * self.scale)))
-        self.screen.blit(title_text, title_rect)
-        
-        # Sous-titre
-        subtitle_text = self.text_font.render("Configuration des touches", True, (200, 200, 200))
-        subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
-        self.screen.blit(subtitle_text, subtitle_rect)
+        # Titre et sous-titre
+        for label in self.settings_labels:
+            label.draw(self.screen)
         
         # Barre de volume pour la musique
-        y_vol = int(580 * self.scale) # Position verticale
-        x_vol = self.screen_width // 2 - int(150 * self.scale)
-        largeur_barre = int(300 * self.scale)
-        hauteur_barre = int(20 * self.scale)
+        x_vol, y_vol, largeur_barre, hauteur_barre = self.volume_bar
 
         # Texte du volume
-        vol_label = self.text_font.render(f"Volume : {int(self.volume * 100)}%", True, WHITE)
-        self.screen.blit(vol_label, (x_vol - int(180 * self.scale), y_vol - int(10 * self.scale)))
+        self.volume_label.set_text(f"Volume : {int(self.volume * 100)}%")
+        self.volume_label.draw(self.screen)
 
         # Dessin de la barre (fond vide)
-        pygame.draw.rect(self.screen, (50, 50, 50), (x_vol, y_vol, largeur_barre, hauteur_barre))
+        pygame.draw.rect(self.screen, (50, 50, 50), self.volume_bar)
         # Dessin du remplissage (volume actuel)
         pygame.draw.rect(self.screen, (255, 215, 0), (x_vol, y_vol, int(largeur_barre * self.volume), hauteur_barre))
         # Bordure
-        pygame.draw.rect(self.screen, WHITE, (x_vol, y_vol, largeur_barre, hauteur_barre), 2)
+        pygame.draw.rect(self.screen, WHITE, self.volume_bar, 2)
 
         # Interaction à la souris
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_click = pygame.mouse.get_pressed()
+        mouse_pos = self.presenter.mouse_pos()
+        mouse_pressed = pygame.mouse.get_pressed()
 
-        if mouse_click[0]: # Si clic gauche enfoncé
+        if mouse_pressed[0]: # Si clic gauche enfoncé
             # On vérifie si la souris est au-dessus de la barre
             if x_vol <= mouse_pos[0] <= x_vol + largeur_barre and y_vol - 10 <= mouse_pos[1] <= y_vol + hauteur_barre + 10:
                 # Calcul du nouveau volume (entre 0.0 et 1.0) basé sur la position X de la souris
@@ -350,30 +468,11 @@ class Game:
                 self.volume = relative_x / largeur_barre
                 self.volume = max(0.0, min(1.0, self.volume)) # On reste entre 0 et 1
                 pygame.mixer.music.set_volume(self.volume)
-                
-        # Actions et leurs touches
-        actions = {
-            'move_left': 'Déplacer à gauche',
-            'move_right': 'Déplacer à droite',
-            'jump': 'Sauter',
-            'heal': 'Soin (Eau)'
-        }
-        
-        y_start = int(260 * self.scale)
-        y_spacing = int(80 * self.scale)
-        button_width = int(250 * self.scale)
-        button_height = int(60 * self.scale)
-        
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
         
         # Afficher chaque action avec sa touche
-        for i, (action_key, action_name) in enumerate(actions.items()):
-            y_pos = y_start + i * y_spacing
-            
+        for action_key, key_button in self.key_buttons.items():
             # Nom de l'action
-            action_text = self.text_font.render(action_name + ":", True, WHITE)
-            self.screen.blit(action_text, (int(150 * self.scale), y_pos + int(15 * self.scale)))
+            self.action_labels[action_key].draw(self.screen)
             
             # Obtenir le nom de la touche
             keys = self.keybindings.get(action_key, [])
@@ -385,13 +484,12 @@ class Game:
                 key_name = "Non assigné"
             
             # Bouton pour changer la touche
-            key_button_x = self.screen_width // 2 + int(50 * self.scale)
             if self.waiting_for_key and self.selected_action == action_key:
-                key_button = Button(key_button_x, y_pos, button_width, button_height,
-                                  "Appuyez sur une touche...", (100, 100, 0), (130, 130, 0), self.scale)
+                key_button.set_text("Appuyez sur une touche...")
+                key_button.set_colors((100, 100, 0), (130, 130, 0))
             else:
-                key_button = Button(key_button_x, y_pos, button_width, button_height,
-                                  key_name, (50, 50, 100), (80, 80, 150), self.scale)
+                key_button.set_text(key_name)
+                key_button.set_colors((50, 50, 100), (80, 80, 150))
             
             key_button.check_hover(mouse_pos)
             key_button.draw(self.screen)
@@ -402,18 +500,8 @@ class Game:
                 self.selected_action = action_key
         
         # Boutons en bas
-        button_width_bottom = int(300 * self.scale)
-        button_height_bottom = int(70 * self.scale)
-        
-        reset_button = Button(self.screen_width // 2 - button_width_bottom - int(20 * self.scale), 
-                             self.screen_height - int(150 * self.scale),
-                             button_width_bottom, button_height_bottom,
-                             "Réinitialiser", (100, 50, 0), (150, 80, 0), self.scale)
-        
-        back_button = Button(self.screen_width // 2 + int(20 * self.scale), 
-                            self.screen_height - int(150 * self.scale),
-                            button_width_bottom, button_height_bottom,
-                            "Retour", (0, 100, 0), (0, 150, 0), self.scale)
+        reset_button = self.settings_buttons['reset']
+        back_button = self.settings_buttons['back']
         
         reset_button.check_hover(mouse_pos)
         back_button.check_hover(mouse_pos)
@@ -423,10 +511,7 @@ class Game:
         
         # Instructions si on attend une touche
         if self.waiting_for_key:
-            instruction_text = self.small_font.render("Appuyez sur ESC pour annuler", True, YELLOW)
-            instruction_rect = instruction_text.get_rect(center=(self.screen_width // 2, 
-                                                                 self.screen_height - int(50 * self.scale)))
-            self.screen.blit(instruction_text, instruction_rect)
+            self.key_instruction.draw(self.screen)
         
         # Actions des boutons
         if reset_button.is_clicked(mouse_pos, mouse_pressed):
@@ -435,144 +520,151 @@ class Game:
         if back_button.is_clicked(mouse_pos, mouse_pressed):
             self.state = GameState.MENU
     
-    def draw_game(self):
-        # Fond du royaume - 2 images côte à côte qui défilent
-        if self.current_kingdom.bg_image:
-            bg = self.current_kingdom.bg_image
-            
-            # Dessiner 2 copies du fond côte à côte
-            self.screen.blit(bg, (-self.camera_x, 0))
-            self.screen.blit(bg, (self.screen_width - self.camera_x, 0))
+    def draw_loading(self):
+        # Écran non bloquant : on repasse en jeu dès que le fond est prêt
+        if self.current_kingdom.background_ready():
+            self.state = GameState.GAME
+            return
+        
+        self.screen.fill(self.current_kingdom.bg_color)
+        
+        dots = "." * (pygame.time.get_ticks() // 400 % 4)
+        loading_text = text_cache.render(self.subtitle_font, f"Chargement{dots}", WHITE)
+        loading_rect = loading_text.get_rect(midleft=(self.screen_width // 2 - int(120 * self.scale), self.screen_height // 2))
+        self.screen.blit(loading_text, loading_rect)
+        
+        name_text = text_cache.render(self.small_font, self.current_kingdom.name, (255, 250, 205))
+        name_rect = name_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + int(60 * self.scale)))
+        self.screen.blit(name_text, name_rect)
+    
+    def draw_game(self, alpha=1.0):
+        # alpha : fraction du pas de simulation écoulée, pour interpoler les positions
+        self.render_camera_x = self.prev_camera_x + (self.camera_x - self.prev_camera_x) * alpha
+        camera_x, camera_y = self.render_camera_x, self.camera_y
+        
+        # Fond du royaume - tuiles répétées sur la largeur du monde, seule la partie visible est dessinée
+        if self.current_kingdom.background:
+            self.current_kingdom.background.draw(self.screen, camera_x)
         else:
             self.screen.fill(self.current_kingdom.bg_color)
         
         # No grid or obstacles in platform mode
         
-        # Dessiner les ennemis
-        for enemy in self.current_kingdom.enemies:
-            enemy.draw(self.screen, self.camera_x, self.camera_y)
+        # Culling : seul ce qui touche la vue (plus une marge pour les halos) est dessiné
+        self.culler.begin(self.screen)
+        
+        # Les entités soumettent leurs commandes à la file de rendu,
+        # vidée ensuite couche par couche (ennemis, barres de vie, projectiles, particules, joueur)
+        enemies = self.current_kingdom.enemies
+        visible_enemies = enemies.visible(self.culler.view, camera_x, camera_y)  # Test vectorisé
+        self.culler.record(len(visible_enemies), len(enemies))
+        for enemy in visible_enemies:
+            enemy.submit(self.render_queue, camera_x, camera_y, alpha)
         
-        # Dessiner les projectiles
-        for projectile in self.projectiles:
-            projectile.draw(self.screen, self.camera_x, self.camera_y)
+        for projectile in self.culler.visible_items(self.projectiles, camera_x, camera_y):
+            projectile.submit(self.render_queue, camera_x, camera_y, alpha)
         
-        # Dessiner les particules
-        for particle in self.particles:
-            particle.draw(self.screen)
+        self.render_queue.call(LAYER_PARTICLES, self.draw_particles)
         
-        # Dessiner le joueur
-        self.player.draw(self.screen, self.camera_x, self.camera_y)
+        self.player.submit(self.render_queue, camera_x, camera_y, alpha)
+        
+        self.render_queue.flush(self.screen)
         
         # HUD
         self.draw_hud()
         
-        # Dialogue
-        if self.dialogue_timer > 0:
+        # Dialogue (le minuteur avance dans update_game)
+        self.dialogue_visible = self.dialogue_timer > 0
+        if self.dialogue_visible:
             self.draw_dialogue()
-            self.dialogue_timer -= 1
+    
+    def draw_particles(self, screen):
+        # Particules (déjà groupées en un seul blits), limitées à la vue
+        drawn = self.particles.draw(screen, self.culler.view)
+        self.culler.record(drawn, len(self.particles))
     
     def draw_hud(self):
-        margin = int(20 * self.scale)
-        
-        # === BARRE DE VIE ===
-        hp_y = margin
-        
-        # Barre de vie directement
-        hp_bar_x = margin
-        hp_bar_width = int(250 * self.scale)
-        hp_bar_height = int(24 * self.scale)
-        hp_percentage = self.player.hp / self.player.max_hp
-        
-        # Fond noir avec bordure dorée (style rétro)
-        pygame.draw.rect(self.screen, (0, 0, 0), (hp_bar_x - 2, hp_y - 2, hp_bar_width + 4, hp_bar_height + 4))
-        pygame.draw.rect(self.screen, (180, 150, 50), (hp_bar_x - 2, hp_y - 2, hp_bar_width + 4, hp_bar_height + 4), 2)
-        
-        # Barre de vie (dégradé vert -> jaune -> rouge selon HP)
-        if hp_percentage > 0.5:
-            bar_color = (50, 220, 50)
-        elif hp_percentage > 0.25:
-            bar_color = (220, 180, 50)
-        else:
-            bar_color = (220, 50, 50)
-        pygame.draw.rect(self.screen, bar_color, (hp_bar_x, hp_y, int(hp_bar_width * hp_percentage), hp_bar_height))
-        
-        # Texte HP
-        hp_text = self.small_font.render(f"{self.player.hp}/{self.player.max_hp}", True, WHITE)
-        self.screen.blit(hp_text, (hp_bar_x + hp_bar_width + int(10 * self.scale), hp_y + int(2 * self.scale)))
-        
-        # === ÉLÉMENTS (style icônes Avatar) ===
-        elem_x = int(500 * self.scale)
-        elem_size = int(32 * self.scale)
-        elem_spacing = int(50 * self.scale)
-        
-        element_colors = {
-            Element.EAU: ((50, 150, 255), "💧"),
-            Element.TERRE: ((139, 90, 43), "🌍"),
-            Element.AIR: ((200, 230, 255), "💨"),
-            Element.FEU: ((255, 80, 30), "🔥")
-        }
-        
-        for i, elem in enumerate([Element.EAU, Element.TERRE, Element.AIR, Element.FEU]):
-            ex = elem_x + i * elem_spacing
-            color, _ = element_colors[elem]
-            
-            if elem in self.player.elements:
-                # Élément débloqué - carré brillant
-                pygame.draw.rect(self.screen, color, (ex, hp_y, elem_size, elem_size))
-                pygame.draw.rect(self.screen, (255, 255, 255), (ex, hp_y, elem_size, elem_size), 2)
-                # Effet brillant
-                pygame.draw.line(self.screen, (255, 255, 255), (ex + 2, hp_y + 2), (ex + 8, hp_y + 8), 2)
-            else:
-                # Élément verrouillé - gris avec croix
-                pygame.draw.rect(self.screen, (40, 40, 40), (ex, hp_y, elem_size, elem_size))
-                pygame.draw.rect(self.screen, (80, 80, 80), (ex, hp_y, elem_size, elem_size), 1)
-        
-        # === ATTAQUE SPÉCIALE (style barre d'énergie) ===
-        special_x = int(750 * self.scale)
-        special_width = int(200 * self.scale)
-        special_height = int(24 * self.scale)
-        
-        # Texte
-        special_label = self.small_font.render("⚡ SPÉCIAL", True, (255, 200, 50))
-        self.screen.blit(special_label, (special_x, hp_y - int(2 * self.scale)))
-        
-        bar_x = special_x + special_label.get_width() + int(15 * self.scale)
-        
-        # Calculer progression
-        if self.player.special_cooldown_max > 0:
-            progress = 1 - (self.player.special_cooldown / self.player.special_cooldown_max)
-        else:
-            progress = 1
-        
-        # Fond et bordure
-        pygame.draw.rect(self.screen, (0, 0, 0), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4))
-        
-        if self.player.special_cooldown <= 0:
-            # Prêt = effet pulsant doré
-            bar_color = (255, 200, 50)
-            pygame.draw.rect(self.screen, (255, 215, 0), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4), 2)
-            status = "PRÊT!"
+        # Couche HUD en cache : reconstruite seulement si ses valeurs changent
+        self.hud.draw(self.screen, self.player, len(self.current_kingdom.enemies))
+    
+    def stats_lines(self):
+        # Statistiques de rendu affichées avec F3
+        return [
+            f"FPS : {self.clock.get_fps():.0f}",
+            f"HUD : {self.hud.rebuild_count} reconstructions / {self.hud.draw_count} images",
+            self.presenter.stats_line(),
+            self.culler.stats_line(),
+            self.quality.stats_line(),
+            self.projectiles.stats_line(),
+            f"Rendu : {self.render_queue.blit_count} sprites en {self.render_queue.batch_count} lots"
+        ]
+    
+    def draw_stats(self):
+        y = self.screen_height - int(30 * self.scale)
+        for line in reversed(self.stats_lines()):
+            text = text_cache.render(self.small_font, line, YELLOW)
+            y -= text.get_height()
+            self.presenter.add(self.screen.blit(text, (int(10 * self.scale), y)))
+    
+    def track_dirty_regions(self, input_event):
+        # Mode rectangles sales : signaler au presenter ce qui a changé
+        if not self.presenter.dirty_rects:
+            return
+        
+        if self.state != self.presented_state:
+            # Nouvel écran : image complète, le temps que les voiles translucides se stabilisent
+            self.presented_state = self.state
+            self.presented_camera = None
+            self.presenter.invalidate(frames=8)
+        
+        if self.state in (GameState.VICTORY, GameState.LOADING):
+            self.presenter.invalidate()
+        elif self.state == GameState.GAME:
+            self.track_game_regions()
         else:
-            bar_color = (150, 100, 30)
-            pygame.draw.rect(self.screen, (100, 80, 30), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4), 2)
-            status = f"{self.player.special_cooldown // 60}s"
-        
-        pygame.draw.rect(self.screen, bar_color, (bar_x, hp_y, int(special_width * progress), special_height))
-        
-        # Texte status
-        status_text = self.small_font.render(status, True, WHITE)
-        self.screen.blit(status_text, (bar_x + special_width // 2 - status_text.get_width() // 2, hp_y + int(2 * self.scale)))
-        
-        # === ENNEMIS RESTANTS ===
-        enemies_x = int(1050 * self.scale)
-        enemy_count = len(self.current_kingdom.enemies)
-        enemies_text = self.small_font.render(f"x{enemy_count}", True, (255, 100, 100) if enemy_count > 0 else (100, 255, 100))
-        self.screen.blit(enemies_text, (enemies_x, hp_y + int(2 * self.scale)))
-        
-        # === OR ===
-        gold_x = int(1150 * self.scale)
-        gold_text = self.small_font.render(f"OR: {self.player.gold}", True, (255, 215, 0))
-        self.screen.blit(gold_text, (gold_x, hp_y + int(2 * self.scale)))
+            # Écrans statiques : ils ne changent qu'avec les clics / touches,
+            # sinon seuls les boutons dont le survol a changé sont envoyés
+            if input_event or pygame.mouse.get_pressed()[0]:
+                self.presenter.invalidate()
+            buttons = {
+                GameState.MENU: list(self.menu_buttons.values()),
+                GameState.SHOP: list(self.shop_buttons.values()),
+                GameState.SETTINGS: list(self.key_buttons.values()) + list(self.settings_buttons.values()),
+                GameState.GAME_OVER: list(self.game_over_buttons.values())
+            }
+            for button in buttons.get(self.state, []):
+                if button.changed:
+                    self.presenter.add(button.dirty_rect)
+    
+    def track_game_regions(self):
+        # La caméra a bougé : tout l'écran change
+        camera = (int(self.render_camera_x), int(self.camera_y))
+        if camera != self.presented_camera:
+            self.presented_camera = camera
+            self.presenter.invalidate()
+        
+        # Zones des entités, à cette image et à la précédente (pour effacer)
+        entities = [*self.current_kingdom.enemies, *self.projectiles, self.player]
+        rects = [self.interpolated_bounds(entity) for entity in entities]
+        particle_rect = self.particles.screen_bounds()
+        if particle_rect:
+            rects.append(particle_rect)
+        for rect in rects + self.game_rects:
+            self.presenter.add(rect)
+        self.game_rects = rects
+        
+        if self.hud.changed:
+            self.presenter.add(self.hud.surface.get_rect())
+        
+        dialogue = self.dialogue_text if self.dialogue_visible else None
+        if dialogue != self.presented_dialogue and self.dialogue_rect:
+            self.presenter.add(self.dialogue_rect)
+        self.presented_dialogue = dialogue
+    
+    def interpolated_bounds(self, entity):
+        # Zone à l'écran entre la position précédente et la courante (rendu interpolé)
+        rect = entity.screen_bounds(self.render_camera_x, self.camera_y)
+        return rect.union(rect.move(int(entity.prev_x - entity.x), int(entity.prev_y - entity.y)))
     
     def draw_dialogue(self):
         # Boîte de dialogue en bas
@@ -581,55 +673,54 @@ class Game:
         margin_x = int(75 * self.scale)
         margin_bottom = int(30 * self.scale)
         
-        dialogue_surface = pygame.Surface((dialogue_width, dialogue_height))
-        dialogue_surface.set_alpha(220)
-        dialogue_surface.fill((20, 20, 40))
-        self.screen.blit(dialogue_surface, (margin_x, self.screen_height - dialogue_height - margin_bottom))
+        dialogue_surface = surface_pool.panel((dialogue_width, dialogue_height), (20, 20, 40), 220)
+        self.dialogue_rect = self.screen.blit(dialogue_surface, (margin_x, self.screen_height - dialogue_height - margin_bottom))
         
         pygame.draw.rect(self.screen, YELLOW, 
                        (margin_x, self.screen_height - dialogue_height - margin_bottom, 
                         dialogue_width, dialogue_height), int(3 * self.scale))
         
-        # Texte
-        lines = []
-        words = self.dialogue_text.split()
-        current_line = ""
-        
+        # Texte (découpage en lignes mis en cache par dialogue)
         text_margin = int(80 * self.scale)
-        for word in words:
-            test_line = current_line + word + " "
-            if self.text_font.size(test_line)[0] < dialogue_width - text_margin:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-        lines.append(current_line)
+        lines = text_cache.wrap(self.text_font, self.dialogue_text, dialogue_width - text_margin)
         
         line_spacing = int(40 * self.scale)
         y = self.screen_height - dialogue_height - int(5 * self.scale)
         for line in lines[:3]:
-            text_surf = self.text_font.render(line.strip(), True, WHITE)
+            text_surf = text_cache.render(self.text_font, line, WHITE)
             self.screen.blit(text_surf, (margin_x + int(25 * self.scale), y))
             y += line_spacing
     
-    def update_game(self, keys):
-        # Mettre à jour le joueur avec les keybindings et la largeur du monde
-        self.player.update(keys, self.current_kingdom.obstacles, self.keybindings, self.current_kingdom.world_width)
+    def store_previous_positions(self):
+        # Positions au début du pas de simulation (interpolation du rendu)
+        self.current_kingdom.enemies.store_previous()
+        for entity in self.projectiles:
+            entity.prev_x, entity.prev_y = entity.x, entity.y
+        self.player.prev_x, self.player.prev_y = self.player.x, self.player.y
+        self.prev_camera_x = self.camera_x
+    
+    def update_game(self, inputs):
+        # Un pas de simulation (1 / TICK_RATE s) : tous les minuteurs comptent en pas.
+        # inputs : bits INPUT_* du pas, seule entrée de la simulation (rejouable)
+        self.store_previous_positions()
+        
+        # Mettre à jour le joueur avec ses entrées et la largeur du monde
+        self.player.update(inputs, self.current_kingdom.obstacles, self.current_kingdom.world_width)
         
         # Tir avec clic gauche de la souris
-        mouse_pressed = pygame.mouse.get_pressed()
-        if mouse_pressed[0]:  # Left click
-            projectile = self.player.shoot()
-            if projectile:
-                self.projectiles.append(projectile)
+        if inputs & INPUT_FIRE:
+            self.player.shoot(self.projectiles)
+        
+        # Double-clic : attaque spéciale
+        if inputs & INPUT_SPECIAL:
+            self.special_attack()
         
         # Mise à jour du cooldown de l'attaque spéciale
         if self.player.special_cooldown > 0:
             self.player.special_cooldown -= 1
         
         # Soin
-        heal_pressed = any(keys[k] for k in self.keybindings.get('heal', []) if k < len(keys))
-        if heal_pressed and Element.EAU in self.player.elements:
+        if inputs & INPUT_HEAL and Element.EAU in self.player.elements:
             if self.player.hp < self.player.max_hp:
                 heal_amount = self.player.heal(30)
                 if heal_amount > 0:
@@ -638,61 +729,66 @@ class Game:
                                         BLUE, 20)
                     self.show_dialogue(f"Soigné de {heal_amount} HP !")
         
-        # Mettre à jour les ennemis
-        for enemy in self.current_kingdom.enemies[:]:
-            enemy.update(self.player.x, self.player.y, self.current_kingdom.obstacles)
-            
-            # Collision avec le joueur
-            player_rect = pygame.Rect(self.player.x, self.player.y, 
-                                     self.player.width, self.player.height)
-            if enemy.get_rect().colliderect(player_rect):
-                damage = self.player.take_damage(enemy.attack)
-                if damage > 0:
-                    self.create_particles(self.player.x + self.player.width // 2,
-                                        self.player.y + self.player.height // 2,
-                                        RED, 15)
+        # Mettre à jour tous les ennemis en une passe, puis préparer les tests de collision
+        enemies = self.current_kingdom.enemies
+        enemies.update(self.player.x)
+        enemies.build_broadphase()
+        
+        # Collision avec le joueur (test vectorisé sur toutes les colonnes)
+        player_rect = pygame.Rect(self.player.x, self.player.y, 
+                                 self.player.width, self.player.height)
+        for enemy in enemies.touching(player_rect):
+            damage = self.player.take_damage(enemy.attack)
+            if damage > 0:
+                self.create_particles(self.player.x + self.player.width // 2,
+                                    self.player.y + self.player.height // 2,
+                                    RED, 15)
         
         # Mettre à jour les projectiles
-        for projectile in self.projectiles[:]:
+        # (index manuel : un projectile retiré est remplacé sur place par le dernier)
+        killed = set()
+        index = 0
+        while index < len(self.projectiles):
+            projectile = self.projectiles[index]
             projectile.update()
             
-            # Vérifier collision avec ennemis
+            # Premier ennemi touché, dans l'ordre de la liste
             proj_rect = pygame.Rect(projectile.x - projectile.size, 
                                    projectile.y - projectile.size,
                                    projectile.size * 2, projectile.size * 2)
             
-            for enemy in self.current_kingdom.enemies[:]:
-                if proj_rect.colliderect(enemy.get_rect()):
-                    if enemy.take_damage(projectile.damage):
-                        self.current_kingdom.enemies.remove(enemy)
-                        # Récompense en or selon le type d'ennemi
-                        if enemy.enemy_type == "boss":
-                            gold_reward = 50
-                        elif enemy.enemy_type == "normal":
-                            gold_reward = 20
-                        else:
-                            gold_reward = 10
-                        self.player.gold += gold_reward
-                        self.create_particles(enemy.x + enemy.width // 2,
-                                            enemy.y + enemy.height // 2,
-                                            YELLOW, 30)
+            enemy = enemies.first_hit(proj_rect)
+            if enemy is not None:
+                if enemy.take_damage(projectile.damage):
+                    killed.add(enemy)
+                    enemies.mark_dead(enemy)
+                    # Récompense en or selon le type d'ennemi
+                    if enemy.enemy_type == "boss":
+                        gold_reward = 50
+                    elif enemy.enemy_type == "normal":
+                        gold_reward = 20
                     else:
-                        self.create_particles(enemy.x + enemy.width // 2,
-                                            enemy.y + enemy.height // 2,
-                                            projectile.color, 15)
-                    
-                    if projectile in self.projectiles:
-                        self.projectiles.remove(projectile)
-                    break
+                        gold_reward = 10
+                    self.player.gold += gold_reward
+                    self.create_particles(enemy.x + enemy.width // 2,
+                                        enemy.y + enemy.height // 2,
+                                        YELLOW, 30)
+                else:
+                    self.create_particles(enemy.x + enemy.width // 2,
+                                        enemy.y + enemy.height // 2,
+                                        projectile.color, 15)
             
-            if projectile.is_dead() and projectile in self.projectiles:
-                self.projectiles.remove(projectile)
+            if enemy is not None or projectile.is_dead():
+                self.projectiles.release_at(index)
+            else:
+                index += 1
+        
+        # Retirer en une passe les ennemis vaincus
+        if killed:
+            enemies.remove(killed)
         
         # Mettre à jour les particules
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
         
         # Vérifier victoire du royaume
         if len(self.current_kingdom.enemies) == 0 and not self.current_kingdom.completed:
@@ -705,7 +801,9 @@ class Game:
             if self.current_kingdom_index >= len(self.kingdoms):
                 self.state = GameState.VICTORY
             else:
-                pygame.time.set_timer(pygame.USEREVENT + 1, 3000, 1)
+                # Précharger le royaume suivant pendant la transition de 3 s
+                self.kingdoms[self.current_kingdom_index].request_background()
+                self.transition_timer = KINGDOM_TRANSITION_TICKS
         
         # Vérifier game over
         if self.player.hp <= 0:
@@ -713,83 +811,80 @@ class Game:
         
         # Mettre à jour la caméra
         self.update_camera()
+        
+        # Dialogue
+        if self.dialogue_timer > 0:
+            self.dialogue_timer -= 1
+        
+        # Transition vers le royaume suivant
+        if self.transition_timer > 0:
+            self.transition_timer -= 1
+            if self.transition_timer == 0:
+                self.enter_next_kingdom()
+    
+    def special_attack(self):
+        if self.player.special_cooldown <= 0:
+            # Créer le projectile selon le type acheté (élément le plus puissant, comme le tir)
+            elem = max(self.player.elements, key=lambda element: element.value)
+            px = self.player.x + self.player.width // 2
+            py = self.player.y + self.player.height // 2
+            
+            if self.player.special_attack_type == 2:
+                special_class = UltraProjectile
+                particle_color = (255, 100, 255)
+            elif self.player.special_attack_type == 1:
+                special_class = MegaProjectile
+                particle_color = (100, 255, 255)
+            else:
+                special_class = SpecialProjectile
+                particle_color = (255, 200, 50)
+            
+            self.projectiles.spawn(special_class, px, py, self.player.direction, elem)
+            self.player.special_cooldown = self.player.special_cooldown_max
+            self.create_particles(px, py, particle_color, 40)
+    
+    def update_victory(self):
+        # Particules de victoire (un pas de simulation)
+        effects = self.random_streams.effects
+        colors = [YELLOW, (255, 215, 0), (255, 255, 150)]
+        for _ in range(3):
+            x = int(effects.integers(0, self.screen_width + 1))
+            y = int(effects.integers(0, self.screen_height + 1))
+            self.create_particles(x, y, colors[effects.integers(len(colors))], 5)
+        
+        self.particles.update()
     
     def draw_victory(self):
         self.screen.fill((20, 20, 40))
         
-        # Particules de victoire
-        for _ in range(3):
-            x = random.randint(0, self.screen_width)
-            y = random.randint(0, self.screen_height)
-            self.create_particles(x, y, random.choice([YELLOW, (255, 215, 0), (255, 255, 150)]), 5)
-        
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
-        
-        # Titre de victoire
-        victory_text = self.title_font.render("VICTOIRE !", True, (255, 215, 0))
-        victory_rect = victory_text.get_rect(center=(self.screen_width // 2, int(180 * self.scale)))
-        self.screen.blit(victory_text, victory_rect)
-        
-        # Messages
-        messages = [
-            "Tu as libéré tous les Gardiens !",
-            "L'équilibre est restauré dans Aelyra.",
-            "Le Néant a été vaincu.",
-            "Tu es le véritable Avatar !"
-        ]
+        self.particles.draw(self.screen)
         
-        y = int(300 * self.scale)
-        message_spacing = int(55 * self.scale)
-        for message in messages:
-            msg_text = self.text_font.render(message, True, WHITE)
-            msg_rect = msg_text.get_rect(center=(self.screen_width // 2, y))
-            self.screen.blit(msg_text, msg_rect)
-            y += message_spacing
+        # Titre de victoire et messages
+        for label in self.victory_labels:
+            label.draw(self.screen)
         
         # Bouton retour au menu
-        button_width = int(350 * self.scale)
-        button_height = int(75 * self.scale)
-        menu_button = Button(self.screen_width // 2 - button_width // 2, int(540 * self.scale), 
-                           button_width, button_height,
-                           "Retour au Menu", (34, 139, 34), (50, 180, 50), self.scale)
-        
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.presenter.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
-        menu_button.check_hover(mouse_pos)
-        menu_button.draw(self.screen)
+        self.victory_button.check_hover(mouse_pos)
+        self.victory_button.draw(self.screen)
         
-        if menu_button.is_clicked(mouse_pos, mouse_pressed):
+        if self.victory_button.is_clicked(mouse_pos, mouse_pressed):
             self.__init__()
     
     def draw_game_over(self):
         self.screen.fill((20, 0, 0))
         
-        # Titre Game Over
-        gameover_text = self.title_font.render("GAME OVER", True, RED)
-        gameover_rect = gameover_text.get_rect(center=(self.screen_width // 2, int(210 * self.scale)))
-        self.screen.blit(gameover_text, gameover_rect)
-        
-        # Message
-        msg_text = self.text_font.render("Le Néant a triomphé...", True, WHITE)
-        msg_rect = msg_text.get_rect(center=(self.screen_width // 2, int(320 * self.scale)))
-        self.screen.blit(msg_text, msg_rect)
+        # Titre Game Over et message
+        for label in self.game_over_labels:
+            label.draw(self.screen)
         
         # Boutons
-        button_width = int(350 * self.scale)
-        button_height = int(75 * self.scale)
-        retry_button = Button(self.screen_width // 2 - button_width // 2, int(420 * self.scale), 
-                            button_width, button_height,
-                            "Réessayer", (139, 0, 0), (180, 0, 0), self.scale)
-        menu_button = Button(self.screen_width // 2 - button_width // 2, int(520 * self.scale), 
-                           button_width, button_height,
-                           "Menu Principal", (100, 100, 100), (150, 150, 150), self.scale)
+        retry_button = self.game_over_buttons['retry']
+        menu_button = self.game_over_buttons['menu']
         
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.presenter.mouse_pos()
         mouse_pressed = pygame.mouse.get_pressed()
         
         retry_button.check_hover(mouse_pos)
@@ -805,15 +900,98 @@ class Game:
         if menu_button.is_clicked(mouse_pos, mouse_pressed):
             self.__init__()
     
+    def simulation_checksum(self):
+        # Empreinte de l'état de jeu (sans les particules, qui suivent le niveau de qualité)
+        player = self.player
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self.state.value, self.current_kingdom_index, self.transition_timer,
+                            player.x, player.y, player.velocity_y, player.on_ground, player.direction.value,
+                            player.hp, player.gold, player.attack_cooldown, player.invincible_frames,
+                            player.special_cooldown, sorted(element.value for element in player.elements))).encode())
+        enemies = self.current_kingdom.enemies
+        for name, _ in enemies.COLUMNS:
+            digest.update(getattr(enemies, name)[:len(enemies)].tobytes())
+        digest.update(repr([(type(projectile).__name__, projectile.x, projectile.y, projectile.lifetime)
+                            for projectile in self.projectiles]).encode())
+        return digest.digest()
+    
+    def save_input_log(self):
+        # Écrit le journal de la partie dans INPUT_LOG_DIR, avec l'empreinte de l'état final
+        log, self.input_log = self.input_log, None
+        if not INPUT_LOG_DIR or not len(log):
+            return
+        log.checksum = self.simulation_checksum()
+        log_dir = os.path.join(os.path.dirname(__file__), INPUT_LOG_DIR)
+        os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{log.seed}.replay")
+        try:
+            log.save(path)
+            print(f"Journal d'entrées : {path} ({len(log)} pas)")
+        except OSError:
+            print(f"Erreur : impossible d'écrire le journal d'entrées {path}")
+    
+    def simulate(self, inputs):
+        # Un pas par octet d'entrée, sans rendu, jusqu'à la fin des entrées ou de la partie
+        ticks = 0
+        for tick_input in inputs:
+            # Chargement d'un royaume : attendre le fond (aucun pas n'était joué)
+            while self.state == GameState.LOADING:
+                if self.current_kingdom.background_ready():
+                    self.state = GameState.GAME
+                else:
+                    time.sleep(0.001)
+            if self.state != GameState.GAME:
+                break
+            self.update_game(tick_input)
+            ticks += 1
+        return ticks
+    
+    def run_headless(self, inputs):
+        # Partie complète sans rendu ; renvoie (pas joués, durée en secondes)
+        self.start_game()
+        self.input_log = None  # Les entrées viennent déjà d'un script ou d'un journal
+        start = time.perf_counter()
+        ticks = self.simulate(inputs)
+        return ticks, time.perf_counter() - start
+    
+    def replay(self, log):
+        # Rejoue un journal (même graine et taille de rendu) ; renvoie (pas, durée, rejeu exact)
+        if log.seed != self.random_streams.seed or log.size != (self.screen_width, self.screen_height):
+            raise ValueError(f"Journal enregistré avec la graine {log.seed} en {log.size[0]}x{log.size[1]}")
+        ticks, elapsed = self.run_headless(log.inputs)
+        return ticks, elapsed, self.simulation_checksum() == log.checksum
+    
     def run(self):
         running = True
         keys_pressed = pygame.key.get_pressed()
         
+        # Simulation à pas fixe : le temps écoulé s'accumule et est consommé
+        # par pas de 1 / TICK_RATE s ; le rendu interpole avec le reste
+        step = 1 / TICK_RATE
+        accumulator = 0.0
+        last_time = time.perf_counter()
+        
         while running:
+            frame_start = time.perf_counter()
+            elapsed = min(frame_start - last_time, MAX_FRAME_TIME)
+            last_time = frame_start
+            input_event = False
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 
+                if event.type in (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                    input_event = True
+                
+                # F3 : afficher / masquer les statistiques de rendu
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_stats = not self.show_stats
+                    self.presenter.invalidate()
+                
+                # F4 : basculer la présentation par rectangles sales
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    self.presenter.toggle()
+                
                 # Gestion des touches pour les paramètres
                 if self.state == GameState.SETTINGS and self.waiting_for_key:
                     if event.type == pygame.KEYDOWN:
@@ -827,43 +1005,40 @@ class Game:
                             self.waiting_for_key = False
                             self.selected_action = None
                 
-                # Double-clic pour attaque spéciale
+                # Double-clic pour attaque spéciale (lancée au prochain pas de simulation)
                 if self.state == GameState.GAME and event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left click
                         current_time = pygame.time.get_ticks()
                         if current_time - self.last_click_time < self.double_click_threshold:
-                            # Double-clic détecté ! Lancer l'attaque spéciale
-                            if self.player.special_cooldown <= 0:
-                                # Créer le projectile selon le type acheté
-                                elem = list(self.player.elements)[0] if self.player.elements else Element.NONE
-                                px = self.player.x + self.player.width // 2
-                                py = self.player.y + self.player.height // 2
-                                
-                                if self.player.special_attack_type == 2:
-                                    special = UltraProjectile(px, py, self.player.direction, elem)
-                                    particle_color = (255, 100, 255)
-                                elif self.player.special_attack_type == 1:
-                                    special = MegaProjectile(px, py, self.player.direction, elem)
-                                    particle_color = (100, 255, 255)
-                                else:
-                                    special = SpecialProjectile(px, py, self.player.direction, elem)
-                                    particle_color = (255, 200, 50)
-                                
-                                self.projectiles.append(special)
-                                self.player.special_cooldown = self.player.special_cooldown_max
-                                self.create_particles(px, py, particle_color, 40)
+                            self.special_requested = True
                         self.last_click_time = current_time
-                
-                # Timer pour passer au royaume suivant
-                if event.type == pygame.USEREVENT + 1:
-                    self.current_kingdom = self.kingdoms[self.current_kingdom_index]
-                    self.player.x = 100
-                    self.player.y = 630  # Spawn on the bridge
-                    self.projectiles = []
-                    self.show_dialogue(f"Bienvenue dans le {self.current_kingdom.name}...")
             
-            # Mettre à jour les touches
+            # Mettre à jour les touches et la souris
             keys_pressed = pygame.key.get_pressed()
+            mouse_pressed = pygame.mouse.get_pressed()
+            
+            # Pas de simulation (jeu et écran de victoire)
+            if self.state in (GameState.GAME, GameState.VICTORY):
+                accumulator += elapsed
+                while accumulator >= step:
+                    accumulator -= step
+                    if self.state == GameState.GAME:
+                        inputs = read_input(keys_pressed, mouse_pressed, self.keybindings, self.special_requested)
+                        self.special_requested = False
+                        self.input_log.record(inputs)
+                        self.update_game(inputs)
+                    elif self.state == GameState.VICTORY:
+                        self.update_victory()
+                    else:
+                        accumulator = 0.0  # Fin de partie pendant le pas
+                        break
+            else:
+                accumulator = 0.0
+            alpha = accumulator / step
+            
+            # Partie terminée : enregistrer son journal d'entrées
+            if self.input_log is not None and self.state in (GameState.VICTORY, GameState.GAME_OVER):
+                self.save_input_log()
             
             # Dessiner selon l'état
             if self.state == GameState.MENU:
@@ -872,16 +1047,34 @@ class Game:
                 self.draw_shop()
             elif self.state == GameState.SETTINGS:
                 self.draw_settings()
+            elif self.state == GameState.LOADING:
+                self.draw_loading()
             elif self.state == GameState.GAME:
-                self.update_game(keys_pressed)
-                self.draw_game()
+                self.draw_game(alpha)
             elif self.state == GameState.VICTORY:
                 self.draw_victory()
             elif self.state == GameState.GAME_OVER:
                 self.draw_game_over()
             
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            self.track_dirty_regions(input_event)
+            if self.show_stats:
+                self.draw_stats()
+            
+            # Gouverneur de qualité : temps de mise à jour + dessin de l'image
+            if self.quality.sample((time.perf_counter() - frame_start) * 1000):
+                self.apply_quality()
+                print(f"Qualité : {self.quality.settings()}")
+            
+            self.presenter.present()
+            self.clock.tick(FPS)  # Limite du rendu seulement (0 = sans limite)
         
+        if self.input_log is not None:
+            self.save_input_log()
+        self.quit()
+
+    def quit(self):
+        # Arrêter le décodeur vidéo avant de quitter : il supprime son cache incomplet
+        if self.menu_video:
+            self.menu_video.close()
         pygame.quit()
         sys.exit()
@@ -0,0 +1,138 @@
+import pygame
+from constants import WHITE, TICK_RATE
+from enums import Element
+from ui import text_cache
+
+
+class HudLayer:
+    """HUD composé sur sa propre surface.
+
+    La surface n'est reconstruite que lorsque les valeurs affichées changent
+    (PV, éléments, cooldown spécial en secondes entières, ennemis restants,
+    or) ; le reste du temps, dessiner le HUD coûte un seul blit.
+    rebuild_count compte les reconstructions effectives.
+    """
+    def __init__(self, screen_width, scale, font):
+        self.scale = scale
+        self.font = font
+        self.surface = pygame.Surface((screen_width, int(80 * scale)), pygame.SRCALPHA)
+        self.rebuild_count = 0
+        self.draw_count = 0
+        self.changed = True  # Vrai si la dernière image a reconstruit la couche
+        self._state = None
+
+    def draw(self, screen, player, enemy_count):
+        cooldown_seconds = player.special_cooldown // TICK_RATE if player.special_cooldown > 0 else None
+        state = (player.hp, player.max_hp, frozenset(player.elements), cooldown_seconds,
+                 player.special_cooldown_max, enemy_count, player.gold)
+        self.changed = state != self._state
+        if self.changed:
+            self._state = state
+            self._render(*state)
+            self.rebuild_count += 1
+        self.draw_count += 1
+        screen.blit(self.surface, (0, 0))
+
+    def _render(self, hp, max_hp, elements, cooldown_seconds, cooldown_max, enemy_count, gold):
+        surface = self.surface
+        surface.fill((0, 0, 0, 0))
+        margin = int(20 * self.scale)
+
+        # === BARRE DE VIE ===
+        hp_y = margin
+
+        # Barre de vie directement
+        hp_bar_x = margin
+        hp_bar_width = int(250 * self.scale)
+        hp_bar_height = int(24 * self.scale)
+        hp_percentage = hp / max_hp
+
+        # Fond noir avec bordure dorée (style rétro)
+        pygame.draw.rect(surface, (0, 0, 0), (hp_bar_x - 2, hp_y - 2, hp_bar_width + 4, hp_bar_height + 4))
+        pygame.draw.rect(surface, (180, 150, 50), (hp_bar_x - 2, hp_y - 2, hp_bar_width + 4, hp_bar_height + 4), 2)
+
+        # Barre de vie (dégradé vert -> jaune -> rouge selon HP)
+        if hp_percentage > 0.5:
+            bar_color = (50, 220, 50)
+        elif hp_percentage > 0.25:
+            bar_color = (220, 180, 50)
+        else:
+            bar_color = (220, 50, 50)
+        pygame.draw.rect(surface, bar_color, (hp_bar_x, hp_y, int(hp_bar_width * hp_percentage), hp_bar_height))
+
+        # Texte HP
+        hp_text = text_cache.render(self.font, f"{hp}/{max_hp}", WHITE)
+        surface.blit(hp_text, (hp_bar_x + hp_bar_width + int(10 * self.scale), hp_y + int(2 * self.scale)))
+
+        # === ÉLÉMENTS (style icônes Avatar) ===
+        elem_x = int(500 * self.scale)
+        elem_size = int(32 * self.scale)
+        elem_spacing = int(50 * self.scale)
+
+        element_colors = {
+            Element.EAU: ((50, 150, 255), "💧"),
+            Element.TERRE: ((139, 90, 43), "🌍"),
+            Element.AIR: ((200, 230, 255), "💨"),
+            Element.FEU: ((255, 80, 30), "🔥")
+        }
+
+        for i, elem in enumerate([Element.EAU, Element.TERRE, Element.AIR, Element.FEU]):
+            ex = elem_x + i * elem_spacing
+            color, _ = element_colors[elem]
+
+            if elem in elements:
+                # Élément débloqué - carré brillant
+                pygame.draw.rect(surface, color, (ex, hp_y, elem_size, elem_size))
+                pygame.draw.rect(surface, (255, 255, 255), (ex, hp_y, elem_size, elem_size), 2)
+                # Effet brillant
+                pygame.draw.line(surface, (255, 255, 255), (ex + 2, hp_y + 2), (ex + 8, hp_y + 8), 2)
+            else:
+                # Élément verrouillé - gris avec croix
+                pygame.draw.rect(surface, (40, 40, 40), (ex, hp_y, elem_size, elem_size))
+                pygame.draw.rect(surface, (80, 80, 80), (ex, hp_y, elem_size, elem_size), 1)
+
+        # === ATTAQUE SPÉCIALE (style barre d'énergie) ===
+        special_x = int(750 * self.scale)
+        special_width = int(200 * self.scale)
+        special_height = int(24 * self.scale)
+
+        # Texte
+        special_label = text_cache.render(self.font, "⚡ SPÉCIAL", (255, 200, 50))
+        surface.blit(special_label, (special_x, hp_y - int(2 * self.scale)))
+
+        bar_x = special_x + special_label.get_width() + int(15 * self.scale)
+
+        # Progression à la seconde près (la barre avance d'un cran par seconde)
+        if cooldown_seconds is None or cooldown_max <= 0:
+            progress = 1
+        else:
+            progress = max(0, 1 - (cooldown_seconds + 1) * TICK_RATE / cooldown_max)
+
+        # Fond et bordure
+        pygame.draw.rect(surface, (0, 0, 0), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4))
+
+        if cooldown_seconds is None:
+            # Prêt = effet pulsant doré
+            bar_color = (255, 200, 50)
+            pygame.draw.rect(surface, (255, 215, 0), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4), 2)
+            status = "PRÊT!"
+        else:
+            bar_color = (150, 100, 30)
+            pygame.draw.rect(surface, (100, 80, 30), (bar_x - 2, hp_y - 2, special_width + 4, special_height + 4), 2)
+            status = f"{cooldown_seconds}s"
+
+        pygame.draw.rect(surface, bar_color, (bar_x, hp_y, int(special_width * progress), special_height))
+
+        # Texte status
+        status_text = text_cache.render(self.font, status, WHITE)
+        surface.blit(status_text, (bar_x + special_width // 2 - status_text.get_width() // 2, hp_y + int(2 * self.scale)))
+
+        # === ENNEMIS RESTANTS ===
+        enemies_x = int(1050 * self.scale)
+        enemies_text = text_cache.render(self.font, f"x{enemy_count}", (255, 100, 100) if enemy_count > 0 else (100, 255, 100))
+        surface.blit(enemies_text, (enemies_x, hp_y + int(2 * self.scale)))
+
+        # === OR ===
+        gold_x = int(1150 * self.scale)
+        gold_text = text_cache.render(self.font, f"OR: {gold}", (255, 215, 0))
+        surface.blit(gold_text, (gold_x, hp_y + int(2 * self.scale)))
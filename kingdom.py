@@ -1,16 +1,19 @@
-import random
-import pygame
 from enums import Element
-from enemy import Enemy
+from enemy import EnemySystem
+from assets import assets
+from background import TiledBackground
+from replay import RandomStreams
 
 class Kingdom:
-    def __init__(self, name, element, bg_color, bg_image_path=None, screen_width=1366, screen_height=768, kingdom_index=0):
+    def __init__(self, name, element, bg_color, bg_image_path=None, screen_width=1366, screen_height=768, kingdom_index=0, random_streams=None):
         self.name = name
         self.element = element
         self.bg_color = bg_color
         self.completed = False
         self.obstacles = []
-        self.enemies = []
+        # Flux aléatoires de la partie (génération du monde, ennemis)
+        self.random_streams = random_streams or RandomStreams()
+        self.enemies = EnemySystem(rng=self.random_streams.enemies)  # Ennemis en colonnes NumPy
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.kingdom_index = kingdom_index
@@ -18,39 +21,50 @@ class Kingdom:
         # Largeur du monde = 2 écrans
         self.world_width = screen_width * 2
         
-        # Load background image
+        # Fond décodé en arrière-plan par le gestionnaire d'assets
+        self.bg_image_path = bg_image_path
         self.bg_image = None
-        if bg_image_path:
-            try:
-                self.bg_image = pygame.image.load(bg_image_path).convert()
-                # Scale to actual screen size
-                self.bg_image = pygame.transform.scale(self.bg_image, (screen_width, screen_height))
-            except:
-                print(f"Warning: Could not load background image {bg_image_path}")
-                self.bg_image = None
+        self.bg_failed = False
+        self.background = None  # Rendu en tuiles, créé quand le fond est prêt
         
         self.generate_world()
     
+    def request_background(self):
+        # Lance le décodage du fond sans bloquer (pool de threads)
+        if self.bg_image_path and self.bg_image is None and not self.bg_failed:
+            assets.image_async(self.bg_image_path, (self.screen_width, self.screen_height), alpha=False)
+    
+    def background_ready(self):
+        # Vrai quand le fond est prêt, ou quand il n'y en a pas / qu'il est illisible
+        # (ou que les images sont désactivées : mode sans affichage)
+        if self.bg_image is not None or self.bg_failed or not self.bg_image_path or not assets.enabled:
+            return True
+        try:
+            self.bg_image = assets.poll(self.bg_image_path, (self.screen_width, self.screen_height), alpha=False)
+        except Exception:
+            print(f"Warning: Could not load background image {self.bg_image_path}")
+            self.bg_failed = True
+            return True
+        if self.bg_image is None:
+            return False
+        self.background = TiledBackground(self.bg_image, self.world_width)
+        return True
+    
     def generate_world(self):
         self.obstacles = []
         
         # Nombre d'ennemis par royaume
         enemy_counts = [3, 5, 6, 8]
         enemy_count = enemy_counts[min(self.kingdom_index, 3)]
-        ground_level = 640
         
         # Répartir les ennemis sur les 2 écrans
         for i in range(enemy_count):
             # Distribution régulière sur la largeur totale (2 écrans)
             x = int(self.screen_width * 0.5 + (i * (self.world_width - self.screen_width) / max(enemy_count, 1)))
-            y = ground_level
-            enemy_type = random.choice(["mini", "normal", "normal"])
-            enemy = Enemy(x, y, enemy_type, self.element, self.kingdom_index)
-            self.enemies.append(enemy)
+            enemy_type = ("mini", "normal", "normal")[self.random_streams.world.integers(3)]
+            self.enemies.spawn(x, enemy_type, self.element, self.kingdom_index)
         
         # Boss à la fin du monde (près de la fin du 2ème écran)
         if self.element != Element.NONE:
             boss_x = int(self.world_width - 200)
-            boss_y = ground_level
-            boss = Enemy(boss_x, boss_y, "boss", self.element, self.kingdom_index)
-            self.enemies.append(boss)
+            self.enemies.spawn(boss_x, "boss", self.element, self.kingdom_index)
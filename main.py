@@ -1,7 +1,64 @@
+import argparse
+import os
+import sys
 import pygame
 from game import Game
+from constants import TICK_RATE
+from replay import InputLog, scripted_inputs
+
+
+def seed_value(text):
+    # La graine est rangée sur 64 bits non signés dans l'en-tête du journal d'entrées
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"graine invalide : {text!r}")
+    if not 0 <= seed < 2 ** 64:
+        raise argparse.ArgumentTypeError(f"la graine doit être comprise entre 0 et 2**64 - 1 (reçu {seed})")
+    return seed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Avatar : L'Équilibre Perdu")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulation sans affichage ni son, aussi vite que possible")
+    parser.add_argument("--replay", metavar="JOURNAL",
+                        help="rejouer un journal d'entrées (.replays/*.replay), sans affichage")
+    parser.add_argument("--ticks", type=int, default=3600,
+                        help="pas simulés avec les entrées scriptées (défaut : 3600)")
+    parser.add_argument("--seed", type=seed_value, help="graine de la partie (0 à 2**64 - 1)")
+    return parser.parse_args()
+
+
+def run_headless(args):
+    log = InputLog.load(args.replay) if args.replay else None
+    if log:
+        game = Game(seed=log.seed, headless=True, size=log.size)
+        ticks, elapsed, exact = game.replay(log)
+    else:
+        game = Game(seed=args.seed, headless=True)
+        ticks, elapsed = game.run_headless(scripted_inputs(args.ticks))
+
+    rate = ticks / elapsed if elapsed > 0 else float("inf")
+    checksum = game.simulation_checksum()
+    print(f"{ticks} pas en {elapsed:.3f} s : {rate:.0f} pas/s ({rate / TICK_RATE:.1f}x le temps réel)")
+    print(f"État final : {game.state.value}, royaume {game.current_kingdom_index + 1}, "
+          f"graine {game.random_streams.seed}, empreinte {checksum.hex()}")
+    if log:
+        print("Rejeu identique à la partie enregistrée" if exact else "Rejeu DIFFÉRENT de la partie enregistrée")
+        return 0 if exact else 1
+    return 0
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.headless or args.replay:
+        # Pilotes SDL factices : à choisir avant pygame.init()
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        pygame.init()
+        sys.exit(run_headless(args))
+
     pygame.init()
-    game = Game()
+    game = Game(seed=args.seed)
     game.run()
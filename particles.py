@@ -1,28 +1,196 @@
-import random
+from collections import OrderedDict
+import numpy as np
 import pygame
 from constants import BLACK
 
-class Particle:
-    def __init__(self, x, y, color, velocity):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocity = velocity
-        self.lifetime = 60
-        self.size = random.randint(3, 8)
-    
+PARTICLE_LIFETIME = 60
+ALPHA_STEP = 16  # Largeur d'un palier d'alpha (16 paliers)
+ALPHA_LEVELS = 256 // ALPHA_STEP
+DIAMETERS = 17  # Diamètres int(size * 2) possibles : 2 à 16
+ROW = DIAMETERS * ALPHA_LEVELS  # Sprites d'une couleur
+MAX_COLORS = 32  # Couleurs gardées dans la palette, éviction LRU au-delà
+
+
+class ParticleSpriteCache:
+    """Cercles pré-rendus, rangés dans une table indexée par (couleur, diamètre, palier d'alpha).
+
+    Chaque couleur reçoit un numéro de palette ; l'index d'un sprite,
+    (numéro * DIAMETERS + diamètre) * ALPHA_LEVELS + palier, se calcule en
+    NumPy pour toutes les particules à la fois. Les sprites sont construits
+    à la première demande ; le rendu est identique à l'ancienne surface
+    créée à chaque image, au palier près.
+
+    La palette est bornée à max_colors couleurs : une nouvelle couleur prend
+    la place de celle émise le moins récemment (LRU) et ses sprites sont
+    libérés, ce qui borne la table à max_colors * ROW sprites.
+    """
+
+    def __init__(self, max_colors=MAX_COLORS):
+        self.max_colors = max_colors
+        self.palette = [None] * max_colors
+        self._slots = OrderedDict()  # Couleur -> numéro, de la moins à la plus récemment émise
+        self._sprites = np.full(max_colors * ROW, None, dtype=object)
+        self._built = np.zeros(max_colors * ROW, dtype=np.bool_)
+
+    def color_index(self, color, live=()):
+        # live : numéros de palette des particules vivantes, jamais évincés s'il reste le choix
+        color = tuple(color)
+        index = self._slots.get(color)
+        if index is not None:
+            self._slots.move_to_end(color)
+            return index
+        if len(self._slots) < self.max_colors:
+            index = len(self._slots)
+        else:
+            in_use = set(np.unique(live).tolist())
+            oldest = next(iter(self._slots))
+            evicted = next((c for c, i in self._slots.items() if i not in in_use), oldest)
+            index = self._slots.pop(evicted)
+            row = slice(index * ROW, (index + 1) * ROW)
+            self._sprites[row] = None
+            self._built[row] = False
+        self._slots[color] = index
+        self.palette[index] = color
+        return index
+
+    @staticmethod
+    def make_index(color_index, diameter, alpha):
+        # Scalaires ou tableaux NumPy
+        return (color_index * DIAMETERS + diameter) * ALPHA_LEVELS + alpha // ALPHA_STEP
+
+    def lookup(self, indices):
+        """Liste des sprites pour un tableau d'index, construits au besoin."""
+        missing = indices[~self._built[indices]]
+        if len(missing):
+            for index in np.unique(missing).tolist():
+                self._sprites[index] = self._build(index)
+                self._built[index] = True
+        return self._sprites[indices].tolist()
+
+    def _build(self, index):
+        row, level = divmod(index, ALPHA_LEVELS)
+        color_index, diameter = divmod(row, DIAMETERS)
+        color = self.palette[color_index]
+        alpha = min(255, level * ALPHA_STEP + ALPHA_STEP - 1)
+        radius = diameter // 2
+        s = pygame.Surface((diameter, diameter))
+        s.set_alpha(alpha)
+        pygame.draw.circle(s, color, (radius, radius), radius)
+        s.set_colorkey(BLACK, pygame.RLEACCEL)
+        return s
+
+
+# Cache partagé par toutes les particules
+sprite_cache = ParticleSpriteCache()
+
+
+class ParticleSystem:
+    """Toutes les particules dans des tableaux NumPy préalloués (une colonne par attribut).
+
+    Frottement, gravité, rétrécissement et fondu sont appliqués en une seule
+    passe vectorisée ; les particules mortes sont retirées par compactage,
+    sans list.remove.
+    """
+
+    def __init__(self, capacity=20000, cache=None, rng=None):
+        self.capacity = capacity
+        self.sprite_cache = cache or sprite_cache
+        self.count = 0
+        # Budget d'émission (réglé par le gouverneur de qualité)
+        self.emission = 1.0
+        self.limit = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int64)  # Numéro de palette du cache de sprites
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, color, count=15):
+        """Émet une gerbe de particules dans toutes les directions (comme Game.create_particles).
+
+        count est réduit par le budget : fraction emission, au plus limit particules vivantes.
+        """
+        count = min(round(count * self.emission), min(self.limit, self.capacity) - self.count)
+        if count <= 0:
+            return
+        new = slice(self.count, self.count + count)
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        speed = self.rng.uniform(3, 8, count)
+        self.x[new] = x
+        self.y[new] = y
+        self.vx[new] = np.cos(angle) * speed
+        self.vy[new] = np.sin(angle) * speed
+        self.size[new] = self.rng.integers(3, 9, count)
+        self.lifetime[new] = PARTICLE_LIFETIME
+        self.color[new] = self.sprite_cache.color_index(color, self.color[:self.count])
+        self.count += count
+
     def update(self):
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
-        self.velocity = (self.velocity[0] * 0.95, self.velocity[1] + 0.2)  # Gravité
-        self.lifetime -= 1
-        self.size = max(1, self.size - 0.1)
-    
-    def draw(self, screen):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / 60))
-            s = pygame.Surface((int(self.size * 2), int(self.size * 2)))
-            s.set_alpha(alpha)
-            s.set_colorkey(BLACK)
-            pygame.draw.circle(s, self.color, (int(self.size), int(self.size)), int(self.size))
-            screen.blit(s, (int(self.x - self.size), int(self.y - self.size)))
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vx[:n] *= 0.95
+        self.vy[:n] += 0.2  # Gravité
+        self.lifetime[:n] -= 1
+        np.maximum(self.size[:n] - 0.1, 1, out=self.size[:n])
+
+        # Compactage : les survivantes sont ramenées au début des tableaux
+        alive = self.lifetime[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            kept = len(keep)
+            for column in (self.x, self.y, self.vx, self.vy, self.size, self.lifetime, self.color):
+                column[:kept] = column[keep]
+            self.count = kept
+
+    def screen_bounds(self):
+        # Rectangle englobant toutes les particules (None s'il n'y en a pas)
+        n = self.count
+        if n == 0:
+            return None
+        size = self.size[:n]
+        left = int((self.x[:n] - size).min()) - 1
+        top = int((self.y[:n] - size).min()) - 1
+        right = int((self.x[:n] + size).max()) + 2
+        bottom = int((self.y[:n] + size).max()) + 2
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def draw(self, screen, view=None):
+        """Dessine les particules ; avec view, seules celles qui touchent ce rectangle.
+
+        Renvoie le nombre de particules dessinées.
+        """
+        n = self.count
+        if n == 0:
+            return 0
+        x, y, size = self.x[:n], self.y[:n], self.size[:n]
+        color = self.color[:n]
+        lifetime = self.lifetime[:n]
+        if view is not None:
+            inside = ((x + size >= view.left) & (x - size < view.right)
+                      & (y + size >= view.top) & (y - size < view.bottom))
+            if not inside.all():
+                x, y, size = x[inside], y[inside], size[inside]
+                color, lifetime = color[inside], lifetime[inside]
+            if len(x) == 0:
+                return 0
+        diameter = (size * 2).astype(np.int64)
+        alpha = 255 * lifetime.astype(np.int64) // PARTICLE_LIFETIME
+        sprites = self.sprite_cache.lookup(self.sprite_cache.make_index(color, diameter, alpha))
+
+        # Un seul blits(), alimenté sans liste intermédiaire
+        px = (x - size).astype(np.int64).tolist()
+        py = (y - size).astype(np.int64).tolist()
+        screen.blits(zip(sprites, zip(px, py)), doreturn=False)
+        return len(px)
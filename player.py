@@ -1,24 +1,43 @@
 import pygame
 import math
 from enums import Direction, Element
-from constants import BLACK, BLUE, WHITE, RED, BROWN, LIGHT_BLUE, GRAY
+from constants import BLACK, BLUE, WHITE, RED, BROWN, LIGHT_BLUE, GRAY, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP
 from projectile import Projectile
+from assets import assets, AssetsDisabled, NORMAL, FLIPPED
+from render_queue import LAYER_PLAYER, LAYER_PLAYER_UI, render_position
 
 class Player:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'speed', 'direction',
+                 'velocity_y', 'on_ground',
+                 'max_hp', 'hp', 'attack', 'defense', 'elements', 'gold',
+                 'animation_frame', 'animation_counter', 'is_moving', 'animation_state',
+                 'attack_cooldown', 'invincible_frames',
+                 'special_cooldown', 'special_attack_type',
+                 'sprites', 'sprites_loaded')
+    
+    # Constantes communes (taille, physique, cooldown spécial, couleurs du fallback)
+    width = 170
+    height = 200
+    gravity = 0.5
+    jump_power = -15
+    ground_level = 550  # Ajusté pour que le personnage soit SUR le sol
+    # Attaque spéciale (cooldown de 10 secondes = 600 pas de simulation à TICK_RATE = 60)
+    special_cooldown_max = 600
+    body_color = (100, 150, 255)
+    head_color = (255, 220, 180)
+    
+    _sprite_set = None  # Sprites d'animation partagés, chargés une seule fois
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.width = 170
-        self.height = 200
+        self.prev_x, self.prev_y = x, y  # Position au pas précédent (interpolation)
         self.speed = 10
         self.direction = Direction.RIGHT
         
         # Physics
         self.velocity_y = 0
-        self.gravity = 0.5
-        self.jump_power = -15
         self.on_ground = False
-        self.ground_level = 550  # Ajusté pour que le personnage soit SUR le sol
         
         # Stats
         self.max_hp = 100
@@ -38,38 +57,38 @@ class Player:
         self.attack_cooldown = 0
         self.invincible_frames = 0
         
-        # Attaque spéciale (cooldown de 10 secondes = 600 frames à 60 FPS)
+        # Attaque spéciale
         self.special_cooldown = 0
-        self.special_cooldown_max = 600
         self.special_attack_type = 0  # 0=base, 1=mega, 2=ultra
         
-        # Load animation sprites
-        self.sprites = {
-            'idle': [],
-            'walking': []
-        }
-        
-        try:
-            # Load idle sprite
-            idle_sprite = pygame.image.load('player_idle.png').convert_alpha()
-            idle_sprite = pygame.transform.scale(idle_sprite, (self.width, self.height))
-            self.sprites['idle'].append(idle_sprite)
-            
-            # Load walking sprites
-            for i in range(1, 4):  # 3 walking frames
-                walk_sprite = pygame.image.load(f'player_walk_{i}.png').convert_alpha()
-                walk_sprite = pygame.transform.scale(walk_sprite, (self.width, self.height))
-                self.sprites['walking'].append(walk_sprite)
-            
-            self.sprites_loaded = True
-        except Exception as e:
-            # Fallback if images not found
-            print(f"Error loading sprites: {e}")
-            self.sprites_loaded = False
-        
-        # Couleurs pour le dessin (fallback)
-        self.body_color = (100, 150, 255)
-        self.head_color = (255, 220, 180)
+        self.sprites, self.sprites_loaded = self.load_sprites()
+    
+    @classmethod
+    def load_sprites(cls):
+        # Load animation sprites (chaque frame = (normale, retournée))
+        if cls._sprite_set is None:
+            sprites = {
+                'idle': [],
+                'walking': []
+            }
+            try:
+                # Load idle sprite
+                idle_sprite = assets.variants('player_idle.png', (cls.width, cls.height))
+                sprites['idle'].append(idle_sprite)
+                
+                # Load walking sprites
+                for i in range(1, 4):  # 3 walking frames
+                    walk_sprite = assets.variants(f'player_walk_{i}.png', (cls.width, cls.height))
+                    sprites['walking'].append(walk_sprite)
+                
+                cls._sprite_set = (sprites, True)
+            except AssetsDisabled:
+                cls._sprite_set = (sprites, False)  # Mode sans affichage : formes de base
+            except Exception as e:
+                # Fallback if images not found
+                print(f"Error loading sprites: {e}")
+                cls._sprite_set = (sprites, False)
+        return cls._sprite_set
     
     def unlock_element(self, element):
         self.elements.add(element)
@@ -114,21 +133,13 @@ class Player:
             self.velocity_y = self.jump_power
             self.on_ground = False
     
-    def update(self, keys, obstacles, keybindings=None, world_width=2732):
-        # Utiliser les keybindings par défaut si non fournis
-        if keybindings is None:
-            keybindings = {
-                'move_left': [pygame.K_q, pygame.K_LEFT],
-                'move_right': [pygame.K_d, pygame.K_RIGHT],
-                'jump': [pygame.K_SPACE],
-                'heal': [pygame.K_e]
-            }
-        
+    def update(self, inputs, obstacles, world_width=2732):
+        # inputs : bits INPUT_* du pas de simulation (voir replay.read_input)
         dx = 0
         
         # Horizontal movement only
-        move_left = any(keys[k] for k in keybindings.get('move_left', []) if k < len(keys))
-        move_right = any(keys[k] for k in keybindings.get('move_right', []) if k < len(keys))
+        move_left = inputs & INPUT_LEFT
+        move_right = inputs & INPUT_RIGHT
         
         if move_left:
             dx = -self.speed
@@ -138,8 +149,7 @@ class Player:
             self.direction = Direction.RIGHT
         
         # Jump
-        jump_pressed = any(keys[k] for k in keybindings.get('jump', []) if k < len(keys))
-        if jump_pressed:
+        if inputs & INPUT_JUMP:
             self.jump()
         
         # Move horizontally with world bounds
@@ -165,7 +175,8 @@ class Player:
         if self.invincible_frames > 0:
             self.invincible_frames -= 1
     
-    def shoot(self):
+    def shoot(self, pool):
+        # Le projectile est pris dans le pool (None si le pool est plein)
         if self.attack_cooldown <= 0:
             self.attack_cooldown = 30
             
@@ -184,7 +195,7 @@ class Player:
             elif Element.EAU in self.elements:
                 element = Element.EAU
             
-            return Projectile(proj_x, proj_y, self.direction, element, self.attack)
+            return pool.spawn(Projectile, proj_x, proj_y, self.direction, element, self.attack)
         return None
     
     def take_damage(self, damage):
@@ -201,9 +212,15 @@ class Player:
         self.hp = min(self.hp, self.max_hp) # Double verification unnecessary but safe
         return self.hp - old_hp
     
-    def draw(self, screen, camera_x, camera_y):
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
+    def screen_bounds(self, camera_x, camera_y):
+        # Zone couverte à l'écran par submit
+        return pygame.Rect(int(self.x - camera_x), int(self.y - camera_y), self.width, self.height)
+    
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        # Commandes de rendu du joueur (sprite ou formes, puis indicateur d'élément)
+        x, y = render_position(self, alpha)
+        screen_x = int(x - camera_x)
+        screen_y = int(y - camera_y)
         
         # Effet de clignotement si invincible
         if self.invincible_frames > 0 and self.invincible_frames % 10 < 5:
@@ -211,91 +228,74 @@ class Player:
         
         # Si les sprites sont chargés, les utiliser
         if self.sprites_loaded and len(self.sprites[self.animation_state]) > 0:
-            # Get the current sprite based on animation state and frame
-            current_sprite = self.sprites[self.animation_state][self.animation_frame]
+            # Get the current sprite based on animation state, frame and direction
+            variants = self.sprites[self.animation_state][self.animation_frame]
+            sprite_to_draw = variants[FLIPPED if self.direction == Direction.LEFT else NORMAL]
             
-            # Flip sprite based on direction
-            sprite_to_draw = current_sprite
-            if self.direction == Direction.LEFT:
-                sprite_to_draw = pygame.transform.flip(current_sprite, True, False)
-            
-            screen.blit(sprite_to_draw, (screen_x, screen_y))
-            
-            # Indicateur d'élément actif
-            if len(self.elements) > 1:
-                element_color = None
-                if Element.FEU in self.elements:
-                    element_color = (255, 100, 30)
-                elif Element.AIR in self.elements:
-                    element_color = (200, 230, 255)
-                elif Element.TERRE in self.elements:
-                    element_color = (139, 90, 43)
-                elif Element.EAU in self.elements:
-                    element_color = (50, 150, 255)
-                
-                if element_color:
-                    pygame.draw.circle(screen, element_color, 
-                                     (screen_x + 35, screen_y + 10), 5)
+            queue.blit(sprite_to_draw, (screen_x, screen_y), LAYER_PLAYER)
         else:
-            # Fallback: dessiner le personnage avec des formes géométriques
-            walk_offset = 0
-            if self.is_moving:
-                walk_offset = math.sin(self.animation_frame * math.pi / 2) * 3
-            
-            # Corps
-            body_rect = pygame.Rect(screen_x + 10, screen_y + 20, 20, 25)
-            pygame.draw.rect(screen, self.body_color, body_rect)
-            pygame.draw.rect(screen, BLACK, body_rect, 2)
-            
-            # Tête
-            pygame.draw.circle(screen, self.head_color, 
-                             (screen_x + 20, int(screen_y + 15 + walk_offset)), 12)
-            pygame.draw.circle(screen, BLACK, 
-                             (screen_x + 20, int(screen_y + 15 + walk_offset)), 12, 2)
-            
-            # Yeux
-            eye_y = int(screen_y + 13 + walk_offset)
-            pygame.draw.circle(screen, BLACK, (screen_x + 16, eye_y), 2)
-            pygame.draw.circle(screen, BLACK, (screen_x + 24, eye_y), 2)
-            
-            # Bras
-            if self.direction == Direction.RIGHT:
-                pygame.draw.line(screen, self.head_color, 
-                               (screen_x + 30, screen_y + 30), 
-                               (screen_x + 38, screen_y + 35), 4)
-            elif self.direction == Direction.LEFT:
-                pygame.draw.line(screen, self.head_color,
-                               (screen_x + 10, screen_y + 30),
-                               (screen_x + 2, screen_y + 35), 4)
-            else:
-                pygame.draw.line(screen, self.head_color,
-                               (screen_x + 10, screen_y + 30),
-                               (screen_x + 5, screen_y + 38), 4)
-                pygame.draw.line(screen, self.head_color,
-                               (screen_x + 30, screen_y + 30),
-                               (screen_x + 35, screen_y + 38), 4)
-            
-            # Jambes
-            leg_offset = int(walk_offset * 2)
-            pygame.draw.line(screen, BLUE,
-                           (screen_x + 15, screen_y + 45),
-                           (screen_x + 13, screen_y + 60 + leg_offset), 4)
-            pygame.draw.line(screen, BLUE,
-                           (screen_x + 25, screen_y + 45),
-                           (screen_x + 27, screen_y + 60 - leg_offset), 4)
+            queue.call(LAYER_PLAYER, self.draw_shape, screen_x, screen_y)
+        
+        # Indicateur d'élément actif
+        if len(self.elements) > 1:
+            element_color = None
+            if Element.FEU in self.elements:
+                element_color = (255, 100, 30)
+            elif Element.AIR in self.elements:
+                element_color = (200, 230, 255)
+            elif Element.TERRE in self.elements:
+                element_color = (139, 90, 43)
+            elif Element.EAU in self.elements:
+                element_color = (50, 150, 255)
             
-            # Indicateur d'élément actif
-            if len(self.elements) > 1:
-                element_color = None
-                if Element.FEU in self.elements:
-                    element_color = (255, 100, 30)
-                elif Element.AIR in self.elements:
-                    element_color = (200, 230, 255)
-                elif Element.TERRE in self.elements:
-                    element_color = (139, 90, 43)
-                elif Element.EAU in self.elements:
-                    element_color = (50, 150, 255)
-                
-                if element_color:
-                    pygame.draw.circle(screen, element_color, 
-                                     (screen_x + 35, screen_y + 10), 5)
+            if element_color:
+                queue.call(LAYER_PLAYER_UI, pygame.draw.circle, element_color, 
+                           (screen_x + 35, screen_y + 10), 5)
+    
+    def draw_shape(self, screen, screen_x, screen_y):
+        # Fallback: dessiner le personnage avec des formes géométriques
+        walk_offset = 0
+        if self.is_moving:
+            walk_offset = math.sin(self.animation_frame * math.pi / 2) * 3
+        
+        # Corps
+        body_rect = pygame.Rect(screen_x + 10, screen_y + 20, 20, 25)
+        pygame.draw.rect(screen, self.body_color, body_rect)
+        pygame.draw.rect(screen, BLACK, body_rect, 2)
+        
+        # Tête
+        pygame.draw.circle(screen, self.head_color, 
+                         (screen_x + 20, int(screen_y + 15 + walk_offset)), 12)
+        pygame.draw.circle(screen, BLACK, 
+                         (screen_x + 20, int(screen_y + 15 + walk_offset)), 12, 2)
+        
+        # Yeux
+        eye_y = int(screen_y + 13 + walk_offset)
+        pygame.draw.circle(screen, BLACK, (screen_x + 16, eye_y), 2)
+        pygame.draw.circle(screen, BLACK, (screen_x + 24, eye_y), 2)
+        
+        # Bras
+        if self.direction == Direction.RIGHT:
+            pygame.draw.line(screen, self.head_color, 
+                           (screen_x + 30, screen_y + 30), 
+                           (screen_x + 38, screen_y + 35), 4)
+        elif self.direction == Direction.LEFT:
+            pygame.draw.line(screen, self.head_color,
+                           (screen_x + 10, screen_y + 30),
+                           (screen_x + 2, screen_y + 35), 4)
+        else:
+            pygame.draw.line(screen, self.head_color,
+                           (screen_x + 10, screen_y + 30),
+                           (screen_x + 5, screen_y + 38), 4)
+            pygame.draw.line(screen, self.head_color,
+                           (screen_x + 30, screen_y + 30),
+                           (screen_x + 35, screen_y + 38), 4)
+        
+        # Jambes
+        leg_offset = int(walk_offset * 2)
+        pygame.draw.line(screen, BLUE,
+                       (screen_x + 15, screen_y + 45),
+                       (screen_x + 13, screen_y + 60 + leg_offset), 4)
+        pygame.draw.line(screen, BLUE,
+                       (screen_x + 25, screen_y + 45),
+                       (screen_x + 27, screen_y + 60 - leg_offset), 4)
@@ -0,0 +1,143 @@
+import math
+import pygame
+from constants import SCREEN_HEIGHT
+
+
+def render_size(display_size, resolution):
+    """Taille de rendu interne : None = native, (w, h), ou fraction de la taille native.
+
+    Le gameplay est placé en pixels absolus dans le cadre de référence
+    SCREEN_WIDTH x SCREEN_HEIGHT (sol, joueur, ennemis) : une taille plus
+    basse que SCREEN_HEIGHT (sans dépasser l'écran) est agrandie à cette
+    hauteur, en gardant ses proportions.
+    """
+    if resolution is None:
+        return tuple(display_size)
+    if isinstance(resolution, (int, float)):
+        width, height = display_size[0] * resolution, display_size[1] * resolution
+    else:
+        width, height = resolution
+    min_height = min(SCREEN_HEIGHT, display_size[1])
+    if height < min_height:
+        width, height = width * min_height / height, min_height
+    return (max(1, round(width)), max(1, round(height)))
+
+
+class Presenter:
+    """Envoi de l'image à l'écran.
+
+    En mode normal, chaque image est présentée avec display.flip(). En mode
+    "rectangles sales", seules les zones signalées par add() sont envoyées
+    avec display.update(rects), et une image sans aucun changement n'est pas
+    présentée du tout. invalidate() force une image complète (changement
+    d'écran, caméra qui bouge, vidéo...).
+
+    Le jeu dessine sur self.screen. Si la résolution interne diffère de
+    celle de l'écran, self.screen est une surface hors écran, agrandie vers
+    l'écran une fois par image (filtre "smooth" ou "nearest") ; add() et
+    mouse_pos() travaillent en coordonnées internes.
+    """
+
+    def __init__(self, display, dirty_rects=False, resolution=None, scaling="smooth"):
+        self.display = display
+        self.dirty_rects = dirty_rects
+        self.scaling = scaling
+        size = render_size(display.get_size(), resolution)
+        if size == display.get_size():
+            self.screen = display
+        else:
+            self.screen = pygame.Surface(size).convert(display)
+        self.scaled = self.screen is not display
+        self.scale_x = display.get_width() / size[0]
+        self.scale_y = display.get_height() / size[1]
+        self.screen_rect = self.screen.get_rect()
+        self.display_rect = display.get_rect()
+        self._rects = []
+        self._full_frames = 1
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.skipped_frames = 0
+        self.pushed_bytes = 0
+        self.full_bytes = 0
+
+    def toggle(self):
+        self.dirty_rects = not self.dirty_rects
+        self.invalidate()
+        self.reset_stats()
+
+    def invalidate(self, frames=1):
+        # Présenter l'écran entier pendant les `frames` prochaines images
+        self._full_frames = max(self._full_frames, frames)
+
+    def add(self, rect):
+        rect = self.screen_rect.clip(rect)
+        if rect.width > 0 and rect.height > 0:
+            self._rects.append(rect)
+
+    def mouse_pos(self):
+        # Position de la souris en coordonnées de rendu interne
+        x, y = pygame.mouse.get_pos()
+        return int(x / self.scale_x), int(y / self.scale_y)
+
+    def _to_display(self, rect):
+        # Rectangle interne -> écran, élargi d'un pixel pour le filtrage
+        left = math.floor(rect.left * self.scale_x) - 1
+        top = math.floor(rect.top * self.scale_y) - 1
+        right = math.ceil(rect.right * self.scale_x) + 1
+        bottom = math.ceil(rect.bottom * self.scale_y) + 1
+        return self.display_rect.clip((left, top, right - left, bottom - top))
+
+    def _upscale(self):
+        if self.scaling == "nearest":
+            pygame.transform.scale(self.screen, self.display_rect.size, self.display)
+        else:
+            pygame.transform.smoothscale(self.screen, self.display_rect.size, self.display)
+
+    def _merge(self, rects):
+        # Fusionne les rectangles qui se chevauchent (moins d'appels SDL)
+        merged = []
+        for rect in sorted(rects, key=lambda r: (r.x, r.y)):
+            for i, other in enumerate(merged):
+                if other.colliderect(rect):
+                    merged[i] = other.union(rect)
+                    break
+            else:
+                merged.append(rect)
+        return merged
+
+    def present(self):
+        bytesize = self.display.get_bytesize()
+        full_bytes = self.display_rect.width * self.display_rect.height * bytesize
+        self.frames += 1
+        self.full_bytes += full_bytes
+
+        if not self.dirty_rects or self._full_frames > 0:
+            if self.scaled:
+                self._upscale()
+            pygame.display.flip()
+            self.pushed_bytes += full_bytes
+        elif self._rects:
+            rects = self._merge(self._rects)
+            if self.scaled:
+                self._upscale()
+                rects = self._merge([self._to_display(rect) for rect in rects])
+            pygame.display.update(rects)
+            self.pushed_bytes += sum(r.width * r.height for r in rects) * bytesize
+        else:
+            self.skipped_frames += 1
+
+        self._full_frames = max(0, self._full_frames - 1)
+        self._rects.clear()
+
+    def stats_line(self):
+        if self.scaled:
+            prefix = f"Présentation ({self.screen_rect.width}x{self.screen_rect.height} -> {self.display_rect.width}x{self.display_rect.height}, {self.scaling})"
+        else:
+            prefix = "Présentation"
+        if not self.dirty_rects:
+            return f"{prefix} : flip complet (F4 : rectangles sales)"
+        saved = 1 - self.pushed_bytes / self.full_bytes if self.full_bytes else 0
+        return (f"{prefix} : {saved:.0%} de bande passante économisée, "
+                f"{self.skipped_frames}/{self.frames} images sautées")
@@ -1,29 +1,46 @@
+import math
 import pygame
 from enums import Direction, Element
-from constants import WHITE
+from constants import WHITE, BLACK
+from surface_pool import surface_pool
+from render_queue import LAYER_PROJECTILE, render_position
+
+
+def screen_bounds(x, y, camera_x, camera_y, half_size):
+    # Carré couvert à l'écran par un projectile centré en (x, y)
+    screen_x = int(x - camera_x)
+    screen_y = int(y - camera_y)
+    return pygame.Rect(screen_x - half_size, screen_y - half_size, half_size * 2 + 1, half_size * 2 + 1)
 
 class Projectile:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'direction', 'element', 'damage', 'lifetime', 'color')
+    
+    speed = 8
+    size = 12
+    
+    # Couleur selon l'élément
+    COLORS = {
+        Element.FEU: (255, 100, 30),
+        Element.EAU: (50, 150, 255),
+        Element.TERRE: (139, 90, 43),
+        Element.AIR: (200, 230, 255),
+    }
+    
+    _sprites = {}  # (couleur, taille) -> sprite pré-rendu
+    
     def __init__(self, x, y, direction, element, damage):
+        self.reset(x, y, direction, element, damage)
+    
+    def reset(self, x, y, direction, element, damage):
+        # (Ré)initialisation, aussi utilisée par ProjectilePool pour recycler l'objet
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y
         self.direction = direction
         self.element = element
         self.damage = damage
-        self.speed = 8
-        self.size = 12
         self.lifetime = 100
-        
-        # Couleur selon l'élément
-        if element == Element.FEU:
-            self.color = (255, 100, 30)
-        elif element == Element.EAU:
-            self.color = (50, 150, 255)
-        elif element == Element.TERRE:
-            self.color = (139, 90, 43)
-        elif element == Element.AIR:
-            self.color = (200, 230, 255)
-        else:
-            self.color = (200, 200, 200)
+        self.color = self.COLORS.get(element, (200, 200, 200))
     
     def update(self):
         if self.direction == Direction.RIGHT:
@@ -37,11 +54,28 @@ class Projectile:
         
         self.lifetime -= 1
     
-    def draw(self, screen, camera_x, camera_y):
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), self.size)
-        pygame.draw.circle(screen, WHITE, (screen_x, screen_y), self.size, 2)
+    @classmethod
+    def get_sprite(cls, color, size):
+        sprite = cls._sprites.get((color, size))
+        if sprite is None:
+            # Cercle plein + contour blanc, centré en (size + 1, size + 1)
+            center = size + 1
+            sprite = pygame.Surface((center * 2, center * 2))
+            pygame.draw.circle(sprite, color, (center, center), size)
+            pygame.draw.circle(sprite, WHITE, (center, center), size, 2)
+            sprite.set_colorkey(BLACK, pygame.RLEACCEL)
+            cls._sprites[(color, size)] = sprite
+        return sprite
+    
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        x, y = render_position(self, alpha)
+        screen_x = int(x - camera_x)
+        screen_y = int(y - camera_y)
+        center = self.size + 1
+        queue.blit(self.get_sprite(self.color, self.size), (screen_x - center, screen_y - center), LAYER_PROJECTILE)
+    
+    def screen_bounds(self, camera_x, camera_y):
+        return screen_bounds(self.x, self.y, camera_x, camera_y, self.size + 1)
     
     def is_dead(self):
         return self.lifetime <= 0
@@ -49,33 +83,44 @@ class Projectile:
 
 class SpecialProjectile:
     """Grosse boule de feu spéciale avec beaucoup de dégâts"""
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'direction', 'element', 'lifetime', 'pulse_timer',
+                 'color', 'glow_color')
+    
+    damage = 150  # Gros dégâts
+    speed = 6
+    size = 40  # Grande taille
+    PULSE = 10  # Amplitude de la pulsation (en pixels)
+    
+    # Couleurs vives pour l'attaque spéciale : (couleur, halo) selon l'élément
+    COLORS = {
+        Element.FEU: ((255, 50, 0), (255, 200, 100)),
+        Element.EAU: ((0, 100, 255), (100, 200, 255)),
+        Element.TERRE: ((139, 69, 19), (200, 150, 100)),
+        Element.AIR: ((200, 240, 255), (255, 255, 255)),
+    }
+    DEFAULT_COLORS = ((255, 215, 0), (255, 255, 200))  # Or par défaut
+    
+    # Détail du halo (réglé par le gouverneur de qualité) :
+    # 2 = trois anneaux, 1 = anneau intérieur seul, 0 = pas de halo.
+    # Moins de halo = image plus petite, donc moins de pixels à mélanger.
+    glow_level = 2
+    
+    # Animation pré-calculée, partagée par toutes les instances :
+    # (couleur, halo, taille, détail) -> une image par taille pulsée
+    _strips = {}
+    
     def __init__(self, x, y, direction, element):
+        self.reset(x, y, direction, element)
+    
+    def reset(self, x, y, direction, element):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y
         self.direction = direction
         self.element = element
-        self.damage = 150  # Gros dégâts
-        self.speed = 6
-        self.size = 40  # Grande taille
         self.lifetime = 150
         self.pulse_timer = 0
-        
-        # Couleurs vives pour l'attaque spéciale
-        if element == Element.FEU:
-            self.color = (255, 50, 0)
-            self.glow_color = (255, 200, 100)
-        elif element == Element.EAU:
-            self.color = (0, 100, 255)
-            self.glow_color = (100, 200, 255)
-        elif element == Element.TERRE:
-            self.color = (139, 69, 19)
-            self.glow_color = (200, 150, 100)
-        elif element == Element.AIR:
-            self.color = (200, 240, 255)
-            self.glow_color = (255, 255, 255)
-        else:
-            self.color = (255, 215, 0)  # Or par défaut
-            self.glow_color = (255, 255, 200)
+        self.color, self.glow_color = self.COLORS.get(element, self.DEFAULT_COLORS)
     
     def update(self):
         if self.direction == Direction.RIGHT:
@@ -86,30 +131,54 @@ class SpecialProjectile:
         self.lifetime -= 1
         self.pulse_timer += 1
     
-    def draw(self, screen, camera_x, camera_y):
-        import math
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        
-        # Effet de pulsation
-        pulse = abs(math.sin(self.pulse_timer * 0.2)) * 10
-        current_size = int(self.size + pulse)
+    @classmethod
+    def get_strip(cls, color, glow_color, size, glow_level=2):
+        key = (color, glow_color, size, glow_level)
+        strip = cls._strips.get(key)
+        if strip is None:
+            strip = [cls._bake_frame(color, glow_color, size + i, glow_level) for i in range(cls.PULSE + 1)]
+            cls._strips[key] = strip
+        return strip
+    
+    @staticmethod
+    def _bake_frame(color, glow_color, current_size, glow_level=2):
+        if glow_level == 2:
+            center = current_size * 2
+        else:
+            # Image réduite au plus grand cercle dessiné
+            center = current_size + 15 * glow_level + 1
+        frame = pygame.Surface((center * 2, center * 2), pygame.SRCALPHA)
         
         # Halo externe (glow)
-        glow_surface = pygame.Surface((current_size * 4, current_size * 4), pygame.SRCALPHA)
-        for i in range(3, 0, -1):
+        rings = 3 if glow_level == 2 else glow_level
+        for i in range(rings, 0, -1):
             alpha = 50 // i
             glow_size = current_size + (i * 15)
-            pygame.draw.circle(glow_surface, (*self.glow_color, alpha), 
-                             (current_size * 2, current_size * 2), glow_size)
-        screen.blit(glow_surface, (screen_x - current_size * 2, screen_y - current_size * 2))
+            pygame.draw.circle(frame, (*glow_color, alpha), (center, center), glow_size)
         
         # Boule principale
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), current_size)
+        pygame.draw.circle(frame, color, (center, center), current_size)
         # Contour lumineux
-        pygame.draw.circle(screen, self.glow_color, (screen_x, screen_y), current_size, 4)
+        pygame.draw.circle(frame, glow_color, (center, center), current_size, 4)
         # Centre blanc brillant
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), current_size // 3)
+        pygame.draw.circle(frame, (255, 255, 255), (center, center), current_size // 3)
+        frame.set_alpha(255, pygame.RLEACCEL)  # Blit plus rapide des zones transparentes
+        return frame
+    
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        x, y = render_position(self, alpha)
+        screen_x = int(x - camera_x)
+        screen_y = int(y - camera_y)
+        
+        # Effet de pulsation : image pré-calculée pour la taille courante
+        pulse = abs(math.sin(self.pulse_timer * 0.2)) * self.PULSE
+        current_size = int(self.size + pulse)
+        frame = self.get_strip(self.color, self.glow_color, self.size, self.glow_level)[current_size - self.size]
+        center = frame.get_width() // 2
+        queue.blit(frame, (screen_x - center, screen_y - center), LAYER_PROJECTILE)
+    
+    def screen_bounds(self, camera_x, camera_y):
+        return screen_bounds(self.x, self.y, camera_x, camera_y, (self.size + self.PULSE) * 2)
     
     def is_dead(self):
         return self.lifetime <= 0
@@ -117,21 +186,33 @@ class SpecialProjectile:
 
 class MegaProjectile:
     """Attaque Mega - achetable en boutique (200 gold)"""
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'direction', 'element', 'lifetime', 'pulse_timer', 'rotation')
+    
+    damage = 250  # Plus de dégâts
+    speed = 8
+    size = 55
+    # Couleurs cyan/électrique
+    color = (0, 200, 255)
+    glow_color = (100, 255, 255)
+    PULSE = 15
+    ROTATION_STEP = 10
+    
+    # (couleur, halo, taille) -> {(taille pulsée, rotation % 60): image}
+    # L'étoile a 6 branches : sa rotation se répète tous les 60 degrés.
+    _strips = {}
+    
     def __init__(self, x, y, direction, element):
+        self.reset(x, y, direction, element)
+    
+    def reset(self, x, y, direction, element):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y
         self.direction = direction
         self.element = element
-        self.damage = 250  # Plus de dégâts
-        self.speed = 8
-        self.size = 55
         self.lifetime = 180
         self.pulse_timer = 0
         self.rotation = 0
-        
-        # Couleurs cyan/électrique
-        self.color = (0, 200, 255)
-        self.glow_color = (100, 255, 255)
     
     def update(self):
         if self.direction == Direction.RIGHT:
@@ -141,32 +222,61 @@ class MegaProjectile:
         
         self.lifetime -= 1
         self.pulse_timer += 1
-        self.rotation += 10
+        self.rotation += self.ROTATION_STEP
     
-    def draw(self, screen, camera_x, camera_y):
-        import math
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        
-        pulse = abs(math.sin(self.pulse_timer * 0.15)) * 15
-        current_size = int(self.size + pulse)
-        
-        # Étoile rotative
-        glow_surface = pygame.Surface((current_size * 4, current_size * 4), pygame.SRCALPHA)
+    @classmethod
+    def get_strip(cls, color, glow_color, size):
+        key = (color, glow_color, size)
+        strip = cls._strips.get(key)
+        if strip is None:
+            strip = {}
+            for current_size in range(size, size + cls.PULSE + 1):
+                for rotation in range(0, 60, cls.ROTATION_STEP):
+                    strip[current_size, rotation] = cls._bake_frame(color, glow_color, current_size, rotation)
+            cls._strips[key] = strip
+        return strip
+    
+    @staticmethod
+    def _bake_frame(color, glow_color, current_size, rotation):
+        # Surface de travail recyclée (seule la zone de l'étoile est gardée)
+        glow_surface = surface_pool.acquire((current_size * 4, current_size * 4), pygame.SRCALPHA)
+        glow_surface.fill((0, 0, 0, 0))
         center = current_size * 2
         
         # Dessiner une étoile à 6 branches
         for i in range(6):
-            angle = math.radians(self.rotation + i * 60)
+            angle = math.radians(rotation + i * 60)
             end_x = center + math.cos(angle) * current_size
             end_y = center + math.sin(angle) * current_size
-            pygame.draw.line(glow_surface, (*self.glow_color, 150), (center, center), (end_x, end_y), 6)
-        
-        screen.blit(glow_surface, (screen_x - center, screen_y - center))
+            pygame.draw.line(glow_surface, (*glow_color, 150), (center, center), (end_x, end_y), 6)
         
         # Cercle central
-        pygame.draw.circle(screen, self.color, (screen_x, screen_y), current_size // 2)
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), current_size // 4)
+        pygame.draw.circle(glow_surface, color, (center, center), current_size // 2)
+        pygame.draw.circle(glow_surface, (255, 255, 255), (center, center), current_size // 4)
+        
+        # On ne garde que la zone de l'étoile (rayon + épaisseur du trait)
+        radius = current_size + 4
+        frame = glow_surface.subsurface((center - radius, center - radius, radius * 2, radius * 2)).copy()
+        surface_pool.release(glow_surface)
+        frame.set_alpha(255, pygame.RLEACCEL)
+        return frame
+    
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        x, y = render_position(self, alpha)
+        screen_x = int(x - camera_x)
+        screen_y = int(y - camera_y)
+        
+        pulse = abs(math.sin(self.pulse_timer * 0.15)) * self.PULSE
+        current_size = int(self.size + pulse)
+        
+        # Étoile rotative pré-calculée
+        strip = self.get_strip(self.color, self.glow_color, self.size)
+        frame = strip[current_size, self.rotation % 60]
+        center = frame.get_width() // 2
+        queue.blit(frame, (screen_x - center, screen_y - center), LAYER_PROJECTILE)
+    
+    def screen_bounds(self, camera_x, camera_y):
+        return screen_bounds(self.x, self.y, camera_x, camera_y, self.size + self.PULSE + 4)
     
     def is_dead(self):
         return self.lifetime <= 0
@@ -174,19 +284,33 @@ class MegaProjectile:
 
 class UltraProjectile:
     """Attaque Ultra - la plus puissante (500 gold)"""
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'direction', 'element', 'lifetime', 'pulse_timer')
+    
+    damage = 500  # Dégâts massifs
+    speed = 5
+    size = 80
+    # Couleurs arc-en-ciel/cosmique
+    colors = ((255, 0, 100), (255, 100, 0), (255, 200, 0), (0, 255, 100), (0, 100, 255), (150, 0, 255))
+    PULSE = 20
+    CORE_SIZE = 20
+    CORE_PULSE = 10
+    
+    # Anneaux et noyau pulsent à des vitesses différentes : deux séries
+    # d'images, (couleurs, taille) -> anneaux par taille, et noyaux
+    _ring_strips = {}
+    _core_strip = None
+    
     def __init__(self, x, y, direction, element):
+        self.reset(x, y, direction, element)
+    
+    def reset(self, x, y, direction, element):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y
         self.direction = direction
         self.element = element
-        self.damage = 500  # Dégâts massifs
-        self.speed = 5
-        self.size = 80
         self.lifetime = 200
         self.pulse_timer = 0
-        
-        # Couleurs arc-en-ciel/cosmique
-        self.colors = [(255, 0, 100), (255, 100, 0), (255, 200, 0), (0, 255, 100), (0, 100, 255), (150, 0, 255)]
     
     def update(self):
         if self.direction == Direction.RIGHT:
@@ -197,23 +321,122 @@ class UltraProjectile:
         self.lifetime -= 1
         self.pulse_timer += 1
     
-    def draw(self, screen, camera_x, camera_y):
-        import math
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        
-        pulse = abs(math.sin(self.pulse_timer * 0.1)) * 20
-        current_size = int(self.size + pulse)
+    @classmethod
+    def get_ring_strip(cls, colors, size):
+        key = (tuple(colors), size)
+        strip = cls._ring_strips.get(key)
+        if strip is None:
+            strip = [cls._bake_rings(colors, size + i) for i in range(cls.PULSE + 1)]
+            cls._ring_strips[key] = strip
+        return strip
+    
+    @classmethod
+    def get_core_strip(cls):
+        if cls._core_strip is None:
+            cls._core_strip = []
+            for core_size in range(cls.CORE_SIZE, cls.CORE_SIZE + cls.CORE_PULSE + 1):
+                core = pygame.Surface((core_size * 2 + 1, core_size * 2 + 1))
+                pygame.draw.circle(core, (255, 255, 255), (core_size, core_size), core_size)
+                core.set_colorkey(BLACK, pygame.RLEACCEL)
+                cls._core_strip.append(core)
+        return cls._core_strip
+    
+    @staticmethod
+    def _bake_rings(colors, current_size):
+        center = current_size + 1
+        frame = pygame.Surface((center * 2 + 1, center * 2 + 1))
         
-        # Anneaux concentriques multicolores
-        for i, color in enumerate(self.colors):
+        # Anneaux concentriques multicolores (opaques : un colorkey suffit)
+        for i, color in enumerate(colors):
             ring_size = current_size - (i * 12)
             if ring_size > 0:
-                pygame.draw.circle(screen, color, (screen_x, screen_y), ring_size, 8)
+                pygame.draw.circle(frame, color, (center, center), ring_size, 8)
+        frame.set_colorkey(BLACK, pygame.RLEACCEL)
+        return frame
+    
+    def submit(self, queue, camera_x, camera_y, alpha=1.0):
+        x, y = render_position(self, alpha)
+        screen_x = int(x - camera_x)
+        screen_y = int(y - camera_y)
+        
+        pulse = abs(math.sin(self.pulse_timer * 0.1)) * self.PULSE
+        current_size = int(self.size + pulse)
+        rings = self.get_ring_strip(self.colors, self.size)[current_size - self.size]
+        center = rings.get_width() // 2
+        queue.blit(rings, (screen_x - center, screen_y - center), LAYER_PROJECTILE)
         
         # Centre blanc brillant qui pulse
-        core_size = int(20 + abs(math.sin(self.pulse_timer * 0.3)) * 10)
-        pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), core_size)
+        core_size = int(self.CORE_SIZE + abs(math.sin(self.pulse_timer * 0.3)) * self.CORE_PULSE)
+        core = self.get_core_strip()[core_size - self.CORE_SIZE]
+        queue.blit(core, (screen_x - core_size, screen_y - core_size), LAYER_PROJECTILE)
+    
+    def screen_bounds(self, camera_x, camera_y):
+        return screen_bounds(self.x, self.y, camera_x, camera_y, self.size + self.PULSE + 1)
     
     def is_dead(self):
         return self.lifetime <= 0
+
+
+class ProjectilePool:
+    """Projectiles actifs, recyclés au lieu d'être recréés.
+
+    Chaque type a une réserve fixe d'objets préalloués (liste libre) ;
+    spawn() en prend un et le réinitialise avec reset(), release_at() le
+    rend en échangeant sa place avec le dernier actif (pas de list.remove).
+    Une fois la réserve vide, spawn() renvoie None : le tir est ignoré.
+    Le pool s'itère comme la liste des projectiles actifs.
+    """
+
+    CAPACITIES = {Projectile: 64, SpecialProjectile: 8, MegaProjectile: 8, UltraProjectile: 8}
+
+    def __init__(self, capacities=None):
+        self.capacities = dict(capacities or self.CAPACITIES)
+        self.active = []
+        # Objets créés sans __init__ : reset() les remplit à chaque sortie du pool
+        self._free = {cls: [cls.__new__(cls) for _ in range(capacity)]
+                      for cls, capacity in self.capacities.items()}
+        self.in_use = dict.fromkeys(self.capacities, 0)
+        self.high_water = dict.fromkeys(self.capacities, 0)
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def __getitem__(self, index):
+        return self.active[index]
+
+    def spawn(self, cls, *args):
+        free = self._free[cls]
+        if not free:
+            return None
+        projectile = free.pop()
+        projectile.reset(*args)
+        self.active.append(projectile)
+        self.in_use[cls] += 1
+        self.high_water[cls] = max(self.high_water[cls], self.in_use[cls])
+        return projectile
+
+    def release_at(self, index):
+        # Le dernier actif prend la place libérée (l'ordre n'est pas conservé)
+        projectile = self.active[index]
+        last = self.active.pop()
+        if index < len(self.active):
+            self.active[index] = last
+        self._free[type(projectile)].append(projectile)
+        self.in_use[type(projectile)] -= 1
+
+    def clear(self):
+        while self.active:
+            self.release_at(len(self.active) - 1)
+
+    def occupancy(self):
+        # {type: (actifs, maximum atteint, capacité)}
+        return {cls.__name__: (self.in_use[cls], self.high_water[cls], capacity)
+                for cls, capacity in self.capacities.items()}
+
+    def stats_line(self):
+        used = sum(self.in_use.values())
+        peak = sum(self.high_water.values())
+        return f"Projectiles : {used}/{sum(self.capacities.values())} (max atteint {peak})"
@@ -0,0 +1,83 @@
+from constants import FPS, TICK_RATE
+
+
+class QualityGovernor:
+    """Ajuste la qualité quand le budget de temps par image est dépassé.
+
+    sample() reçoit le temps de mise à jour + dessin d'une image et tient
+    une moyenne exponentielle. Si elle reste au-dessus du budget pendant
+    downgrade_after images, on descend d'un niveau ; si elle reste sous
+    headroom * budget pendant upgrade_after images, on remonte. L'écart
+    entre les deux seuils et les délais évitent les oscillations.
+    """
+
+    # (nom, fraction des particules émises, particules vivantes max, niveau de halo)
+    LEVELS = (
+        ("haute", 1.0, 20000, 2),
+        ("moyenne", 0.6, 6000, 1),
+        ("basse", 0.3, 2000, 0),
+    )
+
+    def __init__(self, budget_ms=1000 / (FPS or TICK_RATE), smoothing=0.1, headroom=0.7,
+                 downgrade_after=30, upgrade_after=180):
+        self.budget_ms = budget_ms
+        self.smoothing = smoothing
+        self.headroom = headroom
+        self.downgrade_after = downgrade_after
+        self.upgrade_after = upgrade_after
+        self.level = 0
+        self.average_ms = 0.0
+        self._over = 0
+        self._under = 0
+
+    @property
+    def name(self):
+        return self.LEVELS[self.level][0]
+
+    @property
+    def particle_emission(self):
+        return self.LEVELS[self.level][1]
+
+    @property
+    def particle_limit(self):
+        return self.LEVELS[self.level][2]
+
+    @property
+    def glow_level(self):
+        return self.LEVELS[self.level][3]
+
+    def sample(self, frame_ms):
+        """Enregistre une image ; renvoie True si le niveau de qualité a changé."""
+        self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        if self.average_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif self.average_ms < self.budget_ms * self.headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.downgrade_after and self.level < len(self.LEVELS) - 1:
+            return self._set_level(self.level + 1)
+        if self._under >= self.upgrade_after and self.level > 0:
+            return self._set_level(self.level - 1)
+        return False
+
+    def _set_level(self, level):
+        self.level = level
+        self._over = self._under = 0
+        return True
+
+    def settings(self):
+        # Réglages courants (journalisation)
+        return {
+            "niveau": self.name,
+            "particules_emises": self.particle_emission,
+            "particules_max": self.particle_limit,
+            "halo": self.glow_level,
+            "temps_moyen_ms": round(self.average_ms, 2),
+        }
+
+    def stats_line(self):
+        return f"Qualité : {self.name} ({self.average_ms:.1f} ms / {self.budget_ms:.1f} ms)"
@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+# Couches de rendu, dessinées dans l'ordre croissant
+LAYER_ENEMY = 10
+LAYER_PROJECTILE = 20
+LAYER_PARTICLES = 30
+LAYER_PLAYER = 40
+LAYER_PLAYER_UI = 45
+
+
+def render_position(entity, alpha):
+    """Position interpolée entre le pas de simulation précédent et le courant."""
+    return (entity.prev_x + (entity.x - entity.prev_x) * alpha,
+            entity.prev_y + (entity.y - entity.prev_y) * alpha)
+
+
+class RenderQueue:
+    """File de commandes de rendu, vidée une fois par image.
+
+    Les entités soumettent des blits (surface, position, zone facultative)
+    et, pour ce qui ne se met pas en lot, des appels de dessin différés.
+    flush() parcourt les couches dans l'ordre et, dans chaque couche, les
+    commandes dans leur ordre de soumission : les blits consécutifs
+    partent en un seul Surface.blits().
+    """
+
+    def __init__(self):
+        self._layers = defaultdict(list)  # couche -> lots de blits (listes) et appels
+        self.blit_count = 0   # Commandes de la dernière image
+        self.batch_count = 0  # Appels blits() de la dernière image
+
+    def blit(self, surface, position, layer, area=None):
+        commands = self._layers[layer]
+        item = (surface, position) if area is None else (surface, position, area)
+        if commands and type(commands[-1]) is list:
+            commands[-1].append(item)
+        else:
+            commands.append([item])
+
+    def call(self, layer, function, *args):
+        # Dessin non groupable (formes pygame.draw...), appelé avec (screen, *args)
+        self._layers[layer].append((function, args))
+
+    def flush(self, screen):
+        self.blit_count = 0
+        self.batch_count = 0
+        for layer in sorted(self._layers):
+            for command in self._layers[layer]:
+                if type(command) is list:
+                    screen.blits(command, doreturn=False)
+                    self.blit_count += len(command)
+                    self.batch_count += 1
+                else:
+                    function, args = command
+                    function(screen, *args)
+        self._layers.clear()
@@ -0,0 +1,104 @@
+import struct
+import numpy as np
+from constants import INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_HEAL, INPUT_FIRE, INPUT_SPECIAL
+
+
+class RandomStreams:
+    """Générateurs aléatoires de la simulation, un par sous-système.
+
+    Tous dérivent d'une même graine (SeedSequence.spawn) : génération du
+    monde, ennemis, particules et effets tirent chacun dans leur propre
+    flux. Un sous-système qui tire plus ou moins de nombres (moins de
+    particules en qualité basse, par exemple) ne décale donc pas les autres.
+    """
+
+    NAMES = ('world', 'enemies', 'particles', 'effects')
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0])
+        self.seed = seed
+        for name, child in zip(self.NAMES, np.random.SeedSequence(seed).spawn(len(self.NAMES))):
+            setattr(self, name, np.random.default_rng(child))
+
+
+def read_input(keys, mouse_pressed, keybindings, special=False):
+    """Octet d'entrée d'un pas de simulation (bits INPUT_*) à partir du clavier et de la souris."""
+    def held(action):
+        return any(keys[k] for k in keybindings.get(action, []) if k < len(keys))
+
+    inputs = 0
+    if held('move_left'):
+        inputs |= INPUT_LEFT
+    if held('move_right'):
+        inputs |= INPUT_RIGHT
+    if held('jump'):
+        inputs |= INPUT_JUMP
+    if held('heal'):
+        inputs |= INPUT_HEAL
+    if mouse_pressed[0]:
+        inputs |= INPUT_FIRE
+    if special:
+        inputs |= INPUT_SPECIAL
+    return inputs
+
+
+class InputLog:
+    """Journal binaire des entrées d'une partie, un octet par pas de simulation.
+
+    L'en-tête garde la graine, la taille de rendu (la largeur du monde en
+    dépend), le nombre de pas et l'empreinte de l'état final
+    (Game.simulation_checksum), qui permet de vérifier qu'un rejeu est exact.
+    """
+
+    MAGIC = b"AVRL"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBQHHI16s")  # signature, version, graine, largeur, hauteur, pas, empreinte
+
+    def __init__(self, seed, size, inputs=b"", checksum=bytes(16)):
+        self.seed = seed
+        self.size = tuple(size)
+        self.inputs = bytearray(inputs)
+        self.checksum = checksum
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, inputs):
+        self.inputs.append(inputs)
+
+    def save(self, path):
+        width, height = self.size
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, width, height,
+                                     len(self.inputs), self.checksum))
+            f.write(self.inputs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"Journal d'entrées tronqué : {path}")
+        magic, version, seed, width, height, count, checksum = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"Journal d'entrées inconnu : {path}")
+        inputs = data[cls.HEADER.size:]
+        if len(inputs) != count:
+            raise ValueError(f"Journal d'entrées tronqué : {path}")
+        return cls(seed, (width, height), inputs, checksum)
+
+
+def scripted_inputs(ticks):
+    """Entrées de démonstration pour le mode sans affichage.
+
+    Avance en tirant (4 s à droite, 1 s à gauche), saute toutes les 2 s,
+    se soigne et lance l'attaque spéciale toutes les 10 s.
+    """
+    for tick in range(ticks):
+        inputs = INPUT_FIRE | (INPUT_LEFT if tick % 300 >= 240 else INPUT_RIGHT)
+        if tick % 120 < 10:
+            inputs |= INPUT_JUMP
+        if tick % 600 == 0:
+            inputs |= INPUT_SPECIAL | INPUT_HEAL
+        yield inputs
@@ -0,0 +1,102 @@
+"""Scénario de stress des collisions : 500 ennemis x 300 projectiles.
+
+Compare le test de toutes les paires (ancien update_game) à la recherche
+dans les colonnes triées par x (EnemySystem.first_hit), sur les mêmes
+positions, et vérifie que les deux trouvent exactement les mêmes contacts,
+projectiles comme joueur (EnemySystem.touching).
+
+    python stress_collisions.py [ennemis] [projectiles] [pas]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from enums import Element, Direction
+from enemy import EnemySystem
+from projectile import Projectile
+
+
+def make_scene(enemy_count, projectile_count, world_width, rng):
+    enemies = EnemySystem()
+    for _ in range(enemy_count):
+        enemies.spawn(rng.uniform(0, world_width - 50), rng.choice(["mini", "normal", "boss"]),
+                      rng.choice(list(Element)))
+    projectiles = [Projectile(rng.uniform(0, world_width), rng.uniform(560, 700),
+                              rng.choice([Direction.LEFT, Direction.RIGHT]), Element.FEU, 10)
+                   for _ in range(projectile_count)]
+    for projectile in projectiles:
+        projectile.lifetime = 10 ** 9  # Pas d'expiration pendant le scénario
+    return enemies, projectiles
+
+
+def projectile_rect(projectile):
+    return pygame.Rect(projectile.x - projectile.size, projectile.y - projectile.size,
+                       projectile.size * 2, projectile.size * 2)
+
+
+def brute_force(enemies, projectiles):
+    # Toutes les paires, avec un Rect par ennemi et par paire (comme avant)
+    hits = []
+    tests = 0
+    for projectile in projectiles:
+        proj_rect = projectile_rect(projectile)
+        for enemy in enemies:
+            tests += 1
+            if proj_rect.colliderect(enemy.get_rect()):
+                hits.append((projectile, enemy))
+                break
+    return hits, tests
+
+
+def with_columns(enemies, projectiles):
+    enemies.build_broadphase()
+    hits = []
+    for projectile in projectiles:
+        enemy = enemies.first_hit(projectile_rect(projectile))
+        if enemy is not None:
+            hits.append((projectile, enemy))
+    return hits
+
+
+def main():
+    enemy_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    projectile_count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rng = random.Random(1)
+    world_width = 2000  # Limite de déplacement des ennemis (EnemySystem.WORLD_LIMIT)
+    enemies, projectiles = make_scene(enemy_count, projectile_count, world_width, rng)
+
+    timings = {}
+    for name, run in (("toutes les paires", lambda: brute_force(enemies, projectiles)),
+                      ("colonnes triées", lambda: with_columns(enemies, projectiles))):
+        start = time.perf_counter()
+        for _ in range(steps):
+            enemies.update(-1000)  # Joueur hors de portée : errance
+            for projectile in projectiles:
+                projectile.update()
+            run()
+        timings[name] = (time.perf_counter() - start) / steps * 1000
+    # Les deux méthodes sur les mêmes positions finales, puis contre le joueur
+    same = brute_force(enemies, projectiles)[0] == with_columns(enemies, projectiles)
+    for player_x in range(0, world_width, 100):
+        player_rect = pygame.Rect(player_x, 550, 170, 200)
+        expected = [enemy for enemy in enemies if player_rect.colliderect(enemy.get_rect())]
+        same = same and enemies.touching(player_rect) == expected
+
+    print(f"{enemy_count} ennemis x {projectile_count} projectiles, {steps} pas")
+    for name, ms in timings.items():
+        print(f"  {name:18s} {ms:8.2f} ms / pas")
+    print(f"  accélération x{timings['toutes les paires'] / timings['colonnes triées']:.1f}, "
+          f"contacts identiques : {'oui' if same else 'NON'}")
+
+
+if __name__ == "__main__":
+    main()
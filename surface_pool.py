@@ -0,0 +1,52 @@
+import pygame
+
+
+class SurfacePool:
+    """Surfaces réutilisables.
+
+    - panel() : panneaux translucides (voile de la boutique, des paramètres,
+      boîte de dialogue) construits une fois par (taille, couleur, alpha),
+      au lieu d'être alloués et remplis à chaque image.
+    - acquire() / release() : surfaces temporaires recyclées par
+      (taille, flags).
+
+    Tout est vidé par set_resolution() quand la taille de l'écran change.
+    """
+
+    def __init__(self):
+        self._panels = {}  # (taille, couleur, alpha) -> surface
+        self._free = {}    # (taille, flags) -> surfaces temporaires libres
+        self.resolution = None
+
+    def set_resolution(self, size):
+        if size != self.resolution:
+            self.resolution = size
+            self._panels.clear()
+            self._free.clear()
+
+    def panel(self, size, color, alpha):
+        key = (tuple(size), tuple(color), alpha)
+        surface = self._panels.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.fill(color)
+            surface.set_alpha(alpha)
+            self._panels[key] = surface
+        return surface
+
+    def acquire(self, size, flags=0):
+        """Surface temporaire de taille size ; son contenu n'est pas effacé."""
+        free = self._free.get((tuple(size), flags))
+        if free:
+            return free.pop()
+        return pygame.Surface(size, flags)
+
+    def release(self, surface):
+        key = (surface.get_size(), surface.get_flags() & pygame.SRCALPHA)
+        self._free.setdefault(key, []).append(surface)
+
+
+# Pool partagé par tout le jeu
+surface_pool = SurfacePool()
@@ -1,29 +1,163 @@
+from collections import OrderedDict
 import pygame
 from constants import WHITE
 
+_fonts = {}
+
+
+def get_font(size, name=None):
+    """Police partagée : une seule instance par (nom, taille) pour tout le jeu."""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """Service de rendu de texte avec cache LRU.
+
+    Les surfaces sont indexées par (police, texte, couleur, antialias) et
+    les découpages en lignes par (police, texte, largeur max) : un HUD ou
+    un dialogue qui ne change pas ne rastérise plus rien.
+    """
+    def __init__(self, max_surfaces=256, max_layouts=64):
+        self.max_surfaces = max_surfaces
+        self.max_layouts = max_layouts
+        self._surfaces = OrderedDict()
+        self._layouts = OrderedDict()
+
+    @staticmethod
+    def _lookup(cache, key, limit, build):
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache[key] = value
+            if len(cache) > limit:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        return self._lookup(self._surfaces, key, self.max_surfaces,
+                            lambda: font.render(text, antialias, color))
+
+    def wrap(self, font, text, max_width):
+        """Découpe text en lignes de moins de max_width pixels (mot par mot)."""
+        return self._lookup(self._layouts, (font, text, max_width), self.max_layouts,
+                            lambda: self._wrap(font, text, max_width))
+
+    @staticmethod
+    def _wrap(font, text, max_width):
+        lines = []
+        current_line = ""
+        for word in text.split():
+            test_line = current_line + word + " "
+            if font.size(test_line)[0] < max_width:
+                current_line = test_line
+            else:
+                lines.append(current_line)
+                current_line = word + " "
+        lines.append(current_line)
+        return tuple(line.strip() for line in lines)
+
+
+# Cache partagé (HUD, dialogues)
+text_cache = TextCache()
+
+
+class Label:
+    """Texte dont le rendu est mis en cache jusqu'au prochain changement."""
+    def __init__(self, text, font, color, **anchor):
+        self.font = font
+        self.anchor = anchor  # ex. center=(x, y) ou topleft=(x, y)
+        self.text = None
+        self.color = color
+        self.surface = None
+        self.rect = None
+        self.set_text(text)
+
+    def set_text(self, text, color=None):
+        color = color or self.color
+        if text == self.text and color == self.color:
+            return
+        self.text = text
+        self.color = color
+        self.surface = self.font.render(text, True, color)
+        self.rect = self.surface.get_rect(**self.anchor)
+
+    def draw(self, screen):
+        screen.blit(self.surface, self.rect)
+
+
 class Button:
+    """Bouton en mode retenu : créé une fois par écran, rendu mis en cache.
+
+    Le bouton complet (fond arrondi, bordure, texte) est pré-rendu pour
+    chaque couleur ; il n'est recalculé que si le texte, les couleurs ou
+    l'échelle changent.
+    """
     def __init__(self, x, y, width, height, text, color, hover_color, scale=1.0):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.color = color
         self.hover_color = hover_color
         self.current_color = color
-        self.font = pygame.font.Font(None, int(40 * scale))
-    
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.current_color, self.rect, border_radius=10)
-        pygame.draw.rect(screen, WHITE, self.rect, 3, border_radius=10)
+        self.hovered = False
+        self.font = get_font(int(40 * scale))
+        self._cache = {}  # couleur de fond -> (surface du bouton, position)
+        
+        # Suivi des changements pour la présentation par rectangles sales
+        self.changed = True
+        self.dirty_rect = None
+        self._drawn = None
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self._cache.clear()
+
+    def set_colors(self, color, hover_color):
+        if (color, hover_color) != (self.color, self.hover_color):
+            self.color = color
+            self.hover_color = hover_color
+            self.current_color = hover_color if self.hovered else color
+
+    def _render(self, color):
+        # Un texte plus large que le bouton déborde, comme avant : la surface
+        # couvre le bouton et le texte
         text_surf = self.font.render(self.text, True, WHITE)
         text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
-    
-    def check_hover(self, mouse_pos):
-        if self.rect.collidepoint(mouse_pos):
-            self.current_color = self.hover_color
-            return True
+        bounds = self.rect.union(text_rect)
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        button_rect = self.rect.move(-bounds.x, -bounds.y)
+        pygame.draw.rect(surface, color, button_rect, border_radius=10)
+        pygame.draw.rect(surface, WHITE, button_rect, 3, border_radius=10)
+        surface.blit(text_surf, text_rect.move(-bounds.x, -bounds.y))
+        return surface, bounds.topleft
+
+    def draw(self, screen):
+        rendered = self._cache.get(self.current_color)
+        if rendered is None:
+            rendered = self._render(self.current_color)
+            self._cache[self.current_color] = rendered
+        if rendered is not self._drawn:
+            # Zone à rafraîchir : ancien et nouveau rendu
+            rect = rendered[0].get_rect(topleft=rendered[1])
+            self.dirty_rect = rect.union(self._drawn[0].get_rect(topleft=self._drawn[1])) if self._drawn else rect
+            self.changed = True
+            self._drawn = rendered
         else:
-            self.current_color = self.color
-            return False
-    
+            self.changed = False
+        screen.blit(*rendered)
+
+    def check_hover(self, mouse_pos):
+        self.hovered = self.rect.collidepoint(mouse_pos)
+        self.current_color = self.hover_color if self.hovered else self.color
+        return self.hovered
+
     def is_clicked(self, mouse_pos, mouse_pressed):
         return self.rect.collidepoint(mouse_pos) and mouse_pressed[0]
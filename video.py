@@ -0,0 +1,271 @@
+import os
+import struct
+import sys
+import threading
+import time
+import cv2
+import numpy as np
+import pygame
+
+
+# En-tête du cache : magic, version, largeur, hauteur, nb d'images, fps,
+# taille et date de la vidéo source, disposition des pixels
+CACHE_MAGIC = b'AVFC'
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct('<4sHHHIdQq4s')
+CACHE_HEADER_SIZE = 64
+CACHE_MAX_BYTES = 2 * 1024 ** 3  # Au-delà (ex. 4K), on reste en décodage direct
+
+# Disposition des pixels -> (octets par pixel, conversion OpenCV depuis BGR)
+LAYOUTS = {
+    'RGB': (3, cv2.COLOR_BGR2RGB),
+    'BGRA': (4, cv2.COLOR_BGR2BGRA),
+    'RGBX': (4, cv2.COLOR_BGR2RGBA),
+}
+
+
+def pixel_layout(surface):
+    """Disposition d'octets identique à celle de l'écran, pour un blit sans conversion."""
+    if surface.get_bytesize() == 4 and sys.byteorder == 'little':
+        masks = surface.get_masks()[:3]
+        if masks == (0xff0000, 0xff00, 0xff):
+            return 'BGRA'
+        if masks == (0xff, 0xff00, 0xff0000):
+            return 'RGBX'
+    return 'RGB'
+
+
+class VideoBackground:
+    """Vidéo de fond décodée dans un thread.
+
+    Le thread lit, recadre (mode "cover"), redimensionne et convertit chaque
+    image dans un buffer circulaire préalloué ; le thread principal affiche
+    l'image correspondant à l'horloge de la vidéo (fps natif), sans dépendre
+    de la cadence de la boucle de jeu. Le retour au début se fait dans le
+    thread, donc sans à-coup à l'écran.
+
+    Si cache_dir est fourni, la première lecture complète est aussi écrite
+    dans un cache brut propre à la résolution ; les sessions suivantes le
+    projettent en mémoire (memmap) et n'ont plus rien à décoder. Le décodage
+    suit l'affichage : le cache n'est donc écrit qu'après une boucle entière
+    de la vidéo sur le menu. Un passage interrompu (close(), fin du jeu) est
+    abandonné, et les restes d'une session tuée sont supprimés à la suivante.
+    """
+
+    RING_BUDGET = 64 * 1024 * 1024  # Octets max pour le buffer circulaire
+
+    def __init__(self, path, size, layout='RGB', cache_dir=None):
+        self.path = path
+        self.width, self.height = size
+        self.layout = layout
+        self.channels, self._conversion = LAYOUTS[layout]
+        self.fps = 30
+
+        self._surface = None
+        self._start_time = None
+        self._shown = -1  # Numéro de l'image affichée
+        self._thread = None
+        self._frames = None  # Images du cache projeté en mémoire
+
+        self.cache_path = None
+        if cache_dir:
+            self.cache_path = os.path.join(cache_dir, f"menu_video_{self.width}x{self.height}_{layout}.raw")
+            self._frames = self._open_cache()
+        if self._frames is not None:
+            return
+
+        capture = cv2.VideoCapture(path)
+        self.fps = capture.get(cv2.CAP_PROP_FPS) or 30
+        if not capture.isOpened():
+            return
+
+        frame_bytes = self.width * self.height * self.channels
+        slots = max(3, min(8, self.RING_BUDGET // frame_bytes))
+        self._ring = np.empty((slots, self.height, self.width, self.channels), dtype=np.uint8)
+        self._written = 0  # Nombre d'images produites (le slot affiché est réservé)
+        self._cond = threading.Condition()
+        self._stop = False
+
+        frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        writer = None
+        if self.cache_path and 0 < frame_count * frame_bytes <= CACHE_MAX_BYTES:
+            writer = self._open_writer()
+
+        self._thread = threading.Thread(target=self._run, args=(capture, writer),
+                                        name='menu-video', daemon=True)
+        self._thread.start()
+
+    # --- Cache projeté en mémoire ---
+
+    def _source_stat(self):
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _open_cache(self):
+        # Renvoie les images du cache, ou None s'il est absent ou périmé
+        try:
+            with open(self.cache_path, 'rb') as f:
+                header = CACHE_HEADER.unpack(f.read(CACHE_HEADER.size))
+            source = self._source_stat()
+        except (OSError, struct.error):
+            return None
+
+        magic, version, width, height, count, fps, src_size, src_mtime, layout = header
+        frame_bytes = self.width * self.height * self.channels
+        if (magic != CACHE_MAGIC or version != CACHE_VERSION
+                or (width, height) != (self.width, self.height)
+                or layout.rstrip(b'\0').decode() != self.layout
+                or (src_size, src_mtime) != source or count == 0
+                or os.path.getsize(self.cache_path) != CACHE_HEADER_SIZE + count * frame_bytes):
+            return None
+
+        self.fps = fps
+        return np.memmap(self.cache_path, dtype=np.uint8, mode='r', offset=CACHE_HEADER_SIZE,
+                         shape=(count, self.height, self.width, self.channels))
+
+    def _open_writer(self):
+        cache_dir = os.path.dirname(self.cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Caches incomplets laissés par une session interrompue
+            for name in os.listdir(cache_dir):
+                if name.startswith('menu_video_') and name.endswith('.raw.tmp'):
+                    os.remove(os.path.join(cache_dir, name))
+            writer = open(self.cache_path + '.tmp', 'wb')
+        except OSError:
+            return None
+        writer.write(bytes(CACHE_HEADER_SIZE))  # En-tête écrit à la fin
+        return writer
+
+    def _finish_writer(self, writer, count):
+        size, mtime = self._source_stat()
+        header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, self.width, self.height, count,
+                                   self.fps, size, mtime, self.layout.encode())
+        writer.seek(0)
+        writer.write(header)
+        writer.close()
+        os.replace(writer.name, self.cache_path)
+
+    @staticmethod
+    def _abort_writer(writer):
+        writer.close()
+        try:
+            os.remove(writer.name)
+        except OSError:
+            pass
+
+    # --- Décodage en direct ---
+
+    def _crop_box(self, video_width, video_height):
+        # Zone source qui, agrandie, couvre tout l'écran (recadrage centré)
+        scale = max(self.width / video_width, self.height / video_height)
+        crop_w = min(video_width, max(1, round(self.width / scale)))
+        crop_h = min(video_height, max(1, round(self.height / scale)))
+        x = (video_width - crop_w) // 2
+        y = (video_height - crop_h) // 2
+        return x, y, crop_w, crop_h
+
+    def _run(self, capture, writer):
+        slots = len(self._ring)
+        box = None
+        while True:
+            ret, frame = capture.read()
+            if not ret:
+                # Fin de la vidéo : le premier passage complet devient le cache
+                if writer is not None:
+                    try:
+                        self._finish_writer(writer, self._written)
+                    except OSError:
+                        self._abort_writer(writer)
+                    writer = None
+                # On rouvre le fichier plutôt que de chercher
+                capture.release()
+                capture = cv2.VideoCapture(self.path)
+                ret, frame = capture.read()
+                if not ret:
+                    break
+
+            if box is None:
+                box = self._crop_box(frame.shape[1], frame.shape[0])
+            x, y, w, h = box
+            frame = cv2.resize(frame[y:y + h, x:x + w], (self.width, self.height),
+                               interpolation=cv2.INTER_LINEAR)
+
+            with self._cond:
+                # Attendre un slot libre (sans écraser l'image affichée)
+                while not self._stop and self._written - self._shown >= slots:
+                    self._cond.wait()
+                if self._stop:
+                    break
+                slot = self._ring[self._written % slots]
+
+            cv2.cvtColor(frame, self._conversion, dst=slot)
+            if writer is not None:
+                try:
+                    writer.write(slot.data)
+                except OSError:
+                    self._abort_writer(writer)
+                    writer = None
+
+            with self._cond:
+                self._written += 1
+                self._cond.notify_all()
+
+        if writer is not None:
+            self._abort_writer(writer)
+        capture.release()
+
+    # --- Affichage ---
+
+    def _make_surface(self, pixels):
+        # Aucune copie : la surface lit directement le buffer (ou le memmap)
+        surface = pygame.image.frombuffer(pixels, (self.width, self.height), self.layout)
+        if self.layout == 'BGRA':
+            surface.set_alpha(None)  # Octet X ignoré : blit en simple copie
+        return surface
+
+    def _get_cached_surface(self, now):
+        if self._start_time is None:
+            self._start_time = now
+        index = int((now - self._start_time) * self.fps) % len(self._frames)
+        if index != self._shown:
+            self._shown = index
+            self._surface = self._make_surface(self._frames[index])
+        return self._surface
+
+    def get_surface(self):
+        """Renvoie la surface de l'image courante (None tant que rien n'est décodé)."""
+        now = time.perf_counter()
+        if self._frames is not None:
+            return self._get_cached_surface(now)
+        if self._thread is None:
+            return None
+
+        with self._cond:
+            available = self._written - 1
+            if available < 0:
+                return self._surface
+
+            if self._start_time is None:
+                self._start_time = now - (self._shown + 1) / self.fps
+            target = int((now - self._start_time) * self.fps)
+
+            # Trop en retard (menu quitté puis repris) : on recale l'horloge
+            if target - self._shown > len(self._ring):
+                target = self._shown + 1
+                self._start_time = now - target / self.fps
+
+            frame_index = min(target, available)
+            if frame_index > self._shown:
+                self._shown = frame_index
+                self._surface = self._make_surface(self._ring[frame_index % len(self._ring)])
+                self._cond.notify_all()
+        return self._surface
+
+    def close(self):
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join(timeout=1)